@@ -0,0 +1,67 @@
+import importlib
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from common import src_package
+
+bank = importlib.import_module(src_package() + ".PresetBank")
+
+LOOP_MAPPING = [0, 1, 2, 3, 4, 6, 7, 8, 9]
+
+
+def make_preset(rng):
+    # Same shape as FC200._store_preset writes
+    return {str(d): {"parameters": [rng.random() for _ in range(8)], "chain": "Chain %d" % rng.randrange(4)}
+            for d in LOOP_MAPPING}
+
+
+def load_json(folder, name):
+    # Copy of what the script did per clip launch before the preset store
+    with open(os.path.join(folder, name + ".json"), "r") as f:
+        return json.loads(f.read())
+
+
+def rate(func, names, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for name in names:
+            func(name)
+    return rounds * len(names) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    rng = random.Random(200)
+    count = 500
+    folder = tempfile.mkdtemp()
+    try:
+        names = ["Song %d" % i for i in range(count)]
+        for name in names:
+            with open(os.path.join(folder, name + ".json"), "w") as f:
+                f.write(json.dumps(make_preset(rng), indent=2))
+        path = os.path.join(folder, "presets" + bank.BANK_EXTENSION)
+
+        start = time.perf_counter()
+        bank.import_folder(folder, path)
+        print(f"import {count} presets: {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        start = time.perf_counter()
+        with bank.PresetBank(path) as b:
+            opened = time.perf_counter() - start
+        print(f"open bank index:      {opened * 1000:8.2f} ms")
+
+        lookups = rng.sample(names, 100)
+        rounds = 20
+        old = rate(lambda name: load_json(folder, name), lookups, rounds)
+        with bank.PresetBank(path) as b:
+            new = rate(b.get, lookups, rounds)
+        print(f"json:  {old:12,.0f} lookups/s")
+        print(f"bank:  {new:12,.0f} lookups/s")
+
+        json_bytes = sum(os.path.getsize(os.path.join(folder, name + ".json")) for name in names)
+        print(f"size:  json {json_bytes:,} bytes in {count} files, bank {os.path.getsize(path):,} bytes")
+    finally:
+        shutil.rmtree(folder)
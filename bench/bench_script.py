@@ -0,0 +1,112 @@
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from common import headless
+
+h = headless()
+fc200 = h.install()
+
+
+def drain(script, c_instance, clock, ticks=20):
+    """ Ticks until the output queue is empty, returns the frames sent """
+    sent = []
+    for _ in range(ticks):
+        h.tick(script, clock)
+        sent += h.sent_writes(c_instance)
+        if not script._midi_out.pending_count():
+            break
+    return sent
+
+
+def bench_handle_sysex(rounds=20000):
+    script, c, clock = h.make_script()
+    drain(script, c, clock)
+    messages = {
+        "device toggle": [h.frame(0, 0, 127), h.frame(0, 0, 0)],
+        "expression sweep": [h.frame(0, 13, v) for v in range(128)],
+        "invalid frame": [h.frame(0, 0, 127)[:-2] + (0, 247)],
+    }
+    for label, frames in messages.items():
+        count = 0
+        start = time.perf_counter()
+        while count < rounds:
+            for f in frames:
+                script.handle_sysex(f)
+            count += len(frames)
+            if count % 1000 < len(frames):
+                h.tick(script, clock)
+        elapsed = time.perf_counter() - start
+        print(f"handle_sysex {label:17} {count / elapsed:12,.0f} msg/s")
+    script.disconnect()
+
+
+def bench_page_change():
+    script, c, clock = h.make_script()
+    drain(script, c, clock)
+    for pedal, label in ((10, "1 -> 2"), (11, "2 -> 1"), (11, "1 -> 0"), (10, "0 -> 1")):
+        h.press(script, pedal)
+        sent = drain(script, c, clock)
+        leds = sum(1 for bank, _, _ in sent if bank == 1)
+        digits = sum(1 for bank, _, _ in sent if bank == 2)
+        print(f"page {label}: {len(sent):3} frames ({leds} LED, {digits} display)")
+    script.disconnect()
+
+
+def bench_preset_apply(rounds=500):
+    rng = random.Random(200)
+    folder = tempfile.mkdtemp()
+    try:
+        names = ["Song 0", "Song 1"]
+        for name in names:
+            preset = {str(d): {"parameters": [1.0] + [rng.uniform(0, 127) for _ in range(7)], "chain": "Chain %d" % rng.randrange(2)}
+                      for d in fc200.LOOP_MAPPING}
+            with open(os.path.join(folder, name + ".json"), "w") as f:
+                json.dump(preset, f)
+        script, c, clock = h.make_script(preset_folder=folder)
+        script._presets._scanned.wait(5.0)
+        track = script._track
+
+        def launch(slot):
+            track.playing_slot_index = slot
+            h.tick(script, clock)
+
+        for label, forget in (("prepared plan", False), ("compile and apply", True)):
+            launch(0)
+            start = time.perf_counter()
+            for i in range(rounds):
+                if forget:
+                    script._prepared_presets.clear()
+                launch(1 - i % 2)
+            elapsed = time.perf_counter() - start
+            print(f"preset launch {label:17} {elapsed / rounds * 1e6:8.1f} us")
+        script.disconnect()
+    finally:
+        shutil.rmtree(folder)
+
+
+def bench_listener_fan_out(rounds=2000):
+    script, c, clock = h.make_script()
+    drain(script, c, clock)
+    parameters = [script._board_resolver.device(loop).parameters[0] for loop in fc200.LOOP_MAPPING]
+    bare = [h.fl.DeviceParameter("Device On", 1.0, 0.0, 1.0, is_quantized=True) for _ in parameters]
+    for label, targets in (("no listeners", bare), ("script listeners", parameters)):
+        start = time.perf_counter()
+        for i in range(rounds):
+            value = float(i % 2)
+            for parameter in targets:
+                parameter.value = value
+        elapsed = time.perf_counter() - start
+        print(f"value change {label:17} {elapsed / (rounds * len(targets)) * 1e6:8.2f} us")
+    print(f"registered listeners: {len(script._registry)}")
+    script.disconnect()
+
+
+if __name__ == "__main__":
+    bench_handle_sysex()
+    bench_page_change()
+    bench_preset_apply()
+    bench_listener_fan_out()
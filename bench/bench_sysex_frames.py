@@ -0,0 +1,58 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from SysExFrames import SysExFrames  # noqa: E402
+
+
+def send_midi(msg):
+    pass
+
+
+def log_message(msg):
+    pass
+
+
+def checksum(body):
+    return (128 - ((body[0] + body[1] + body[2]) % 128)) % 128
+
+
+def send_sysex_old(body):
+    # Copy of FC200._send_sysex before the frame table
+    sysex_msg = (
+            240,
+            65,
+            0,
+            114,
+            18,
+            body[0],
+            body[1],
+            body[2],
+            checksum(body),
+            247
+        )
+    log_message(f"\nsending out: {sysex_msg}")
+    send_midi(sysex_msg)
+
+
+def send_sysex_new(body):
+    send_midi(SysExFrames.frame(body[0], body[1], body[2]))
+
+
+def page_change(send):
+    # leds_off + a full leds_recall + both display digits
+    for i in range(0, 10):
+        send([1, i, 0])
+    for i in range(0, 10):
+        send([1, i, 127])
+    send([2, 1, 0])
+    send([2, 0, 48])
+
+
+if __name__ == "__main__":
+    number = 20000
+    for name, send in (("old", send_sysex_old), ("new", send_sysex_new)):
+        seconds = timeit.timeit(lambda: page_change(send), number=number)
+        per_frame = seconds / (number * 22) * 1e9
+        print(f"{name}: {per_frame:8.1f} ns/frame, {seconds / number * 1e6:8.2f} us/page change")
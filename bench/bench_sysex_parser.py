@@ -0,0 +1,61 @@
+import importlib
+import time
+
+from common import src_package
+
+parser = importlib.import_module(src_package() + ".SysExParser")
+
+
+def handle_sysex_old(midi_bytes, log_message):
+    # Copy of the checks FC200.handle_sysex did before the parser
+    if midi_bytes[0] != 240:
+        return None
+    if midi_bytes[1] != 65:
+        return None
+    if midi_bytes[2] != 0:
+        return None
+    if midi_bytes[3] != 114:
+        return None
+    if midi_bytes[4] != 18:
+        return None
+    bank = midi_bytes[5]
+    pedal = midi_bytes[6]
+    value = midi_bytes[7]
+    body = [bank, pedal, value]
+    log_message(f"\nReceived SysEx: {midi_bytes}\nbank {bank}, pedal {pedal}, value {value}")
+    checksum = midi_bytes[-2]
+    check_checksum = (128 - ((bank + pedal + value) % 128)) % 128
+    if checksum != check_checksum:
+        return None
+    if midi_bytes[-1] == 247:
+        return body
+    return None
+
+
+def frame(bank, pedal, value):
+    return (240, 65, 0, 114, 18, bank, pedal, value, (128 - ((bank + pedal + value) % 128)) % 128, 247)
+
+
+def rate(func, messages, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for message in messages:
+            func(message)
+    return rounds * len(messages) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    # An expression pedal sweep, the densest stream the script receives
+    sweep = [frame(0, 13, v) for v in range(128)] + [frame(0, 13, v) for v in range(127, -1, -1)]
+    rounds = 2000
+    log = lambda message: None
+    old = rate(lambda m: handle_sysex_old(m, log), sweep, rounds)
+    new = rate(parser.parse, sweep, rounds)
+    print(f"old: {old:12,.0f} msg/s")
+    print(f"new: {new:12,.0f} msg/s")
+
+    batch = sum(sweep[:32], ())
+    start = time.perf_counter()
+    for _ in range(rounds):
+        parser.parse_batch(batch)
+    print(f"batch of 32: {rounds * 32 / (time.perf_counter() - start):12,.0f} msg/s")
@@ -0,0 +1,30 @@
+import os
+import sys
+import types
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+def src_package(name="fc200"):
+    """
+    Registers src/ as a package without running its __init__, so modules that
+    do not import Live can be benchmarked outside Ableton.
+    """
+    if name not in sys.modules:
+        package = types.ModuleType(name)
+        package.__path__ = [SRC]
+        sys.modules[name] = package
+    return name
+
+
+def headless():
+    """
+    Returns the headless harness, with the Live and _Framework stand-ins on
+    sys.path so the whole script can run.
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "headless")
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    import harness
+    harness.install()
+    return harness
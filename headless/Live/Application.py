@@ -0,0 +1,7 @@
+class Application:
+    class View:
+        class NavDirection:
+            up = 0
+            down = 1
+            left = 2
+            right = 3
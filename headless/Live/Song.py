@@ -0,0 +1,7 @@
+class RecordingQuantization:
+    rec_q_no_q = 0
+    rec_q_quarter = 1
+    rec_q_eight = 2
+    rec_q_eight_triplet = 3
+    rec_q_eight_eight_triplet = 4
+    rec_q_sixtenth = 5
@@ -0,0 +1,2 @@
+"""Stand-in for Live's embedded `Live` module."""
+from . import Song, Application  # noqa: F401
@@ -0,0 +1,3 @@
+class ButtonElement(object):
+    def __init__(self, *a, **k):
+        pass
@@ -0,0 +1,3 @@
+class ButtonMatrixElement(object):
+    def __init__(self, *a, **k):
+        pass
@@ -0,0 +1,60 @@
+"""Stand-in for _Framework.ControlSurface with a deterministic tick."""
+from . import Task
+from .ControlSurfaceComponent import ControlSurfaceComponent
+
+TIMER_DELAY = 0.1
+
+
+class ControlSurface(object):
+    def __init__(self, c_instance):
+        self._c_instance = c_instance
+        # As in Live, components built by the script reach the song through it
+        ControlSurfaceComponent._canonical_parent = self
+        self._tasks = Task.TaskGroup()
+        self._timer_callbacks = []
+        self._scheduled_messages = []
+
+    def song(self):
+        return self._c_instance.song()
+
+    def application(self):
+        return self._c_instance.application()
+
+    def log_message(self, *message):
+        self._c_instance.log_message(" ".join(str(m) for m in message))
+
+    def show_message(self, message):
+        self._c_instance.show_message(message)
+
+    def _send_midi(self, midi_bytes, optimized=None):
+        self._c_instance.send_midi(midi_bytes)
+        return True
+
+    def _register_timer_callback(self, callback):
+        self._timer_callbacks.append(callback)
+
+    def _unregister_timer_callback(self, callback):
+        self._timer_callbacks.remove(callback)
+
+    def schedule_message(self, delay_in_ticks, callback, parameter=None):
+        self._scheduled_messages.append([delay_in_ticks, callback, parameter])
+
+    def update_display(self):
+        for callback in list(self._timer_callbacks):
+            callback()
+        self._tasks.update(TIMER_DELAY)
+        due = [m for m in self._scheduled_messages if m[0] <= 0]
+        self._scheduled_messages = [m for m in self._scheduled_messages if m[0] > 0]
+        for message in self._scheduled_messages:
+            message[0] -= 1
+        for _, callback, parameter in due:
+            callback() if parameter is None else callback(parameter)
+
+    def handle_sysex(self, midi_bytes):
+        pass
+
+    def refresh_state(self):
+        pass
+
+    def disconnect(self):
+        self._tasks = Task.TaskGroup()
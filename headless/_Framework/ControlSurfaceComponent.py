@@ -0,0 +1,29 @@
+class ControlSurfaceComponent(object):
+    _canonical_parent = None
+
+    def __init__(self, *a, **k):
+        self._is_enabled = True
+
+    def is_enabled(self):
+        return self._is_enabled
+
+    def set_enabled(self, enabled):
+        self._is_enabled = bool(enabled)
+
+    def song(self):
+        return self._canonical_parent.song()
+
+    def application(self):
+        return self._canonical_parent.application()
+
+    def _register_timer_callback(self, callback):
+        self._canonical_parent._register_timer_callback(callback)
+
+    def _unregister_timer_callback(self, callback):
+        self._canonical_parent._unregister_timer_callback(callback)
+
+    def update(self):
+        pass
+
+    def disconnect(self):
+        pass
@@ -0,0 +1,3 @@
+class EncoderElement(object):
+    def __init__(self, *a, **k):
+        pass
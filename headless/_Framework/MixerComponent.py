@@ -0,0 +1,5 @@
+from .ControlSurfaceComponent import ControlSurfaceComponent
+
+
+class MixerComponent(ControlSurfaceComponent):
+    pass
@@ -0,0 +1,3 @@
+class SliderElement(object):
+    def __init__(self, *a, **k):
+        pass
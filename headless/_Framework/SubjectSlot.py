@@ -0,0 +1,4 @@
+def subject_slot(event):
+    def decorator(func):
+        return func
+    return decorator
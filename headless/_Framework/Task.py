@@ -0,0 +1,112 @@
+"""Minimal stand-in for _Framework.Task, driven by TaskGroup.update(delta)."""
+
+
+class Task(object):
+    def __init__(self):
+        self.is_killed = False
+
+    def kill(self):
+        self.is_killed = True
+        return self
+
+    @property
+    def is_running(self):
+        return not self.is_killed
+
+    def update(self, delta):
+        """ Advances the task, returns True once it has finished """
+        raise NotImplementedError
+
+
+class _Wait(Task):
+    def __init__(self, duration):
+        super(_Wait, self).__init__()
+        self.duration = duration
+        self.remaining = duration
+
+    def reset(self):
+        self.remaining = self.duration
+
+    def update(self, delta):
+        self.remaining -= delta
+        return self.remaining <= 1e-9
+
+
+class _Run(Task):
+    def __init__(self, func):
+        super(_Run, self).__init__()
+        self.func = func
+
+    def reset(self):
+        pass
+
+    def update(self, delta):
+        self.func()
+        return True
+
+
+class _Sequence(Task):
+    def __init__(self, tasks):
+        super(_Sequence, self).__init__()
+        self.tasks = tasks
+        self.index = 0
+
+    def reset(self):
+        self.index = 0
+        for task in self.tasks:
+            task.reset()
+
+    def update(self, delta):
+        while self.index < len(self.tasks):
+            if not self.tasks[self.index].update(delta):
+                return False
+            self.index += 1
+            delta = 0
+        return True
+
+
+class _Loop(Task):
+    def __init__(self, task):
+        super(_Loop, self).__init__()
+        self.task = task
+
+    def reset(self):
+        self.task.reset()
+
+    def update(self, delta):
+        if self.task.update(delta):
+            self.task.reset()
+        return False
+
+
+def wait(duration):
+    return _Wait(duration)
+
+
+def run(func):
+    return _Run(func)
+
+
+def sequence(*tasks):
+    return _Sequence(list(tasks))
+
+
+def loop(*tasks):
+    return _Loop(tasks[0] if len(tasks) == 1 else sequence(*tasks))
+
+
+class TaskGroup(object):
+    def __init__(self):
+        self._tasks = []
+
+    def add(self, task):
+        self._tasks.append(task)
+        return task
+
+    def update(self, delta):
+        for task in list(self._tasks):
+            if task.is_killed or task.update(delta):
+                self._tasks.remove(task)
+
+    def __len__(self):
+        return len(self._tasks)
@@ -0,0 +1 @@
+"""Stand-in for Live's _Framework, only the parts the FC200 script uses."""
@@ -0,0 +1,290 @@
+"""
+Fake Live object model: Song, Track, ClipSlot, Clip, Scene, Device, Chain,
+DeviceParameter and Application with the add_/remove_/_has_listener API the
+scripts use.
+"""
+
+
+class Subject(object):
+    """ Generic Live listener API: add_<prop>_listener, remove_..., <prop>_has_listener """
+
+    def __init__(self):
+        self._listeners = {}
+
+    def __getattr__(self, name):
+        if name.startswith("add_") and name.endswith("_listener"):
+            prop = name[4:-9]
+            return lambda callback: self._add_listener(prop, callback)
+        if name.startswith("remove_") and name.endswith("_listener"):
+            prop = name[7:-9]
+            return lambda callback: self._remove_listener(prop, callback)
+        if name.endswith("_has_listener"):
+            prop = name[:-13]
+            return lambda callback: callback in self.__dict__["_listeners"].get(prop, ())
+        raise AttributeError(name)
+
+    def _add_listener(self, prop, callback):
+        callbacks = self._listeners.setdefault(prop, [])
+        if callback in callbacks:
+            raise RuntimeError("Listener already connected")
+        callbacks.append(callback)
+
+    def _remove_listener(self, prop, callback):
+        callbacks = self._listeners.get(prop, [])
+        if callback not in callbacks:
+            raise RuntimeError("Listener not connected")
+        callbacks.remove(callback)
+
+    def notify(self, prop):
+        for callback in list(self._listeners.get(prop, ())):
+            callback()
+
+    def listener_count(self, prop=None):
+        if prop is not None:
+            return len(self._listeners.get(prop, ()))
+        return sum(len(c) for c in self._listeners.values())
+
+
+def observable(prop):
+    attr = "_" + prop
+
+    def getter(self):
+        return getattr(self, attr)
+
+    def setter(self, value):
+        if getattr(self, attr) != value:
+            object.__setattr__(self, attr, value)
+            self.notify(prop)
+
+    return property(getter, setter)
+
+
+class DeviceParameter(Subject):
+    name = observable("name")
+
+    def __init__(self, name="Parameter", value=0.0, min=0.0, max=127.0, is_enabled=True, is_quantized=False):
+        super(DeviceParameter, self).__init__()
+        self._name = name
+        self._value = value
+        self.min = min
+        self.max = max
+        self.is_enabled = is_enabled
+        self.is_quantized = is_quantized
+        self.writes = 0
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        if not self.min <= value <= self.max:
+            raise ValueError("Invalid value")
+        self.writes += 1
+        if self._value != value:
+            self._value = value
+            self.notify("value")
+
+    def __str__(self):
+        if self.is_quantized and self.max == 1:
+            return "On" if self._value else "Off"
+        return str(self._value)
+
+
+class View(Subject):
+    pass
+
+
+class DeviceView(View):
+    selected_chain = observable("selected_chain")
+
+    def __init__(self):
+        super(DeviceView, self).__init__()
+        self._selected_chain = None
+
+
+class Chain(Subject):
+    name = observable("name")
+    devices = observable("devices")
+
+    def __init__(self, name="Chain", devices=()):
+        super(Chain, self).__init__()
+        self._name = name
+        self._devices = tuple(devices)
+
+
+class Device(Subject):
+    name = observable("name")
+    chains = observable("chains")
+    parameters = observable("parameters")
+
+    def __init__(self, name="Device", parameters=(), chains=()):
+        super(Device, self).__init__()
+        self._name = name
+        self._parameters = tuple(parameters)
+        self._chains = tuple(chains)
+        self.view = DeviceView()
+        if self._chains:
+            self.view._selected_chain = self._chains[0]
+        self.can_have_chains = bool(self._chains)
+
+
+class Clip(Subject):
+    name = observable("name")
+
+    def __init__(self, name="Clip"):
+        super(Clip, self).__init__()
+        self._name = name
+
+
+class ClipSlot(Subject):
+    clip = observable("clip")
+    is_triggered = observable("is_triggered")
+
+    def __init__(self, clip=None):
+        super(ClipSlot, self).__init__()
+        self._clip = clip
+        self._is_triggered = False
+
+    @property
+    def has_clip(self):
+        return self._clip is not None
+
+    def fire(self):
+        self.is_triggered = True
+
+
+class Track(Subject):
+    name = observable("name")
+    devices = observable("devices")
+    clip_slots = observable("clip_slots")
+    playing_slot_index = observable("playing_slot_index")
+    fired_slot_index = observable("fired_slot_index")
+
+    def __init__(self, name="Track", devices=(), clip_slots=()):
+        super(Track, self).__init__()
+        self._name = name
+        self._devices = tuple(devices)
+        self._clip_slots = tuple(clip_slots)
+        self._playing_slot_index = -1
+        self._fired_slot_index = -1
+        self.is_foldable = False
+        self.fold_state = False
+
+
+class Scene(Subject):
+    name = observable("name")
+
+    def __init__(self, name="Scene", song=None):
+        super(Scene, self).__init__()
+        self._name = name
+        self._song = song
+
+    def fire(self):
+        if self._song is not None:
+            self._song.fire_scene(self)
+
+
+class SongView(View):
+    selected_scene = observable("selected_scene")
+    selected_track = observable("selected_track")
+
+    def __init__(self):
+        super(SongView, self).__init__()
+        self._selected_scene = None
+        self._selected_track = None
+        self.highlighted_clip_slot = None
+
+
+class Song(Subject):
+    is_playing = observable("is_playing")
+    metronome = observable("metronome")
+    tracks = observable("tracks")
+    scenes = observable("scenes")
+    tempo = observable("tempo")
+    midi_recording_quantization = observable("midi_recording_quantization")
+
+    def __init__(self, tracks=(), scenes=()):
+        super(Song, self).__init__()
+        self._is_playing = False
+        self._metronome = False
+        self._tracks = tuple(tracks)
+        self._scenes = tuple(scenes)
+        self._tempo = 120.0
+        self._midi_recording_quantization = 0
+        self.view = SongView()
+        if self._scenes:
+            self.view._selected_scene = self._scenes[0]
+        if self._tracks:
+            self.view._selected_track = self._tracks[0]
+        self.visible_tracks = self._tracks
+        self.return_tracks = ()
+        self.taps = 0
+
+    def tap_tempo(self):
+        self.taps += 1
+
+    def start_playing(self):
+        self.is_playing = True
+
+    def stop_playing(self):
+        self.is_playing = False
+
+    def stop_all_clips(self):
+        for track in self._tracks:
+            track.playing_slot_index = -1
+
+    def fire_scene(self, scene):
+        index = self._scenes.index(scene)
+        for track in self._tracks:
+            if index < len(track.clip_slots) and track.clip_slots[index].has_clip:
+                track.playing_slot_index = index
+
+
+class ApplicationView(Subject):
+    """ Application.view, its is_view_visible listeners are registered per view name """
+
+    def __init__(self):
+        super(ApplicationView, self).__init__()
+        self._visible = {"Session": True, "Detail": True, "Detail/DeviceChain": True}
+        self.scrolls = []
+
+    def is_view_visible(self, name):
+        return self._visible.get(name, False)
+
+    def show_view(self, name):
+        if name.startswith("Detail/"):
+            # The clip and device chain share the detail view
+            for detail in ("Detail/Clip", "Detail/DeviceChain"):
+                self._set_visible(detail, detail == name)
+            name = "Detail"
+        self._set_visible(name, True)
+
+    def hide_view(self, name):
+        self._set_visible(name, False)
+
+    def focus_view(self, name):
+        self.show_view(name)
+
+    def scroll_view(self, direction, name, modifier_pressed):
+        self.scrolls.append((direction, name, modifier_pressed))
+
+    def add_is_view_visible_listener(self, name, callback):
+        self._add_listener(("is_view_visible", name), callback)
+
+    def remove_is_view_visible_listener(self, name, callback):
+        self._remove_listener(("is_view_visible", name), callback)
+
+    def is_view_visible_has_listener(self, name, callback):
+        return callback in self._listeners.get(("is_view_visible", name), ())
+
+    def _set_visible(self, name, visible):
+        if self.is_view_visible(name) != visible:
+            self._visible[name] = visible
+            self.notify(("is_view_visible", name))
+
+
+class Application(Subject):
+    def __init__(self):
+        super(Application, self).__init__()
+        self.view = ApplicationView()
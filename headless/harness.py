@@ -0,0 +1,132 @@
+"""
+Runs the FC200 script outside Ableton.
+
+install() puts the Live and _Framework stand-ins of this folder on sys.path
+and registers src/ as the fc200 package, after which make_script() builds a
+script on a fake song with a board rack, clips and scenes. The script's clock
+is a ManualClock and update_display() is only called from tick(), so a run
+does the same thing every time.
+"""
+import os
+import sys
+import types
+
+import fake_live as fl
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(HERE, "..", "src")
+PACKAGE = "fc200"
+TICK_SECONDS = 0.1      # Live calls update_display every 100 ms
+
+
+def install():
+    """ Makes the stand-ins importable and returns the FC200 module """
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    if PACKAGE not in sys.modules:
+        # The package __init__ is skipped, Live looks for create_instance there
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [SRC]
+        sys.modules[PACKAGE] = package
+    __import__(PACKAGE + ".FC200")
+    return sys.modules[PACKAGE + ".FC200"]
+
+
+def module(name):
+    """ A module of the script, e.g. module("PresetBank") """
+    install()
+    __import__(PACKAGE + "." + name)
+    return sys.modules[PACKAGE + "." + name]
+
+
+class ManualClock:
+    """ A monotonic clock that only moves when advance() is called """
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class CInstance:
+    """ What Live passes to create_instance, recording everything the script sends """
+
+    def __init__(self, song, application=None):
+        self._song = song
+        self._application = application or fl.Application()
+        self.sent = []
+        self.log = []
+        self.messages = []
+
+    def song(self):
+        return self._song
+
+    def application(self):
+        return self._application
+
+    def send_midi(self, midi_bytes):
+        self.sent.append(tuple(midi_bytes))
+
+    def log_message(self, message):
+        self.log.append(message)
+
+    def show_message(self, message):
+        self.messages.append(message)
+
+
+def make_device(index, chains=2):
+    parameters = [fl.DeviceParameter("Device On", 1.0, 0.0, 1.0, is_quantized=True)]
+    parameters += [fl.DeviceParameter("Macro %d" % i, 0.0, 0.0, 127.0) for i in range(1, 9)]
+    return fl.Device("Loop %d" % index, parameters, [fl.Chain("Chain %d" % c) for c in range(chains)])
+
+
+def make_song(loops=10, scenes=8):
+    """ One track holding the board rack, with a clip named "Song <n>" in every scene """
+    board = fl.Chain("Board", [make_device(i) for i in range(loops)])
+    rack = fl.Device("Board Rack", [], [board])
+    slots = [fl.ClipSlot(fl.Clip("Song %d" % i)) for i in range(scenes)]
+    track = fl.Track("Guitar", [rack], slots)
+    song = fl.Song([track], [])
+    song._scenes = tuple(fl.Scene("Scene %d" % i, song) for i in range(scenes))
+    song.view._selected_scene = song._scenes[0]
+    return song
+
+
+def make_script(song=None, clock=None, preset_folder=None):
+    """ Returns (script, c_instance, clock) """
+    fc200 = install()
+    song = song or make_song()
+    clock = clock or ManualClock()
+    fc200.CLOCK = clock
+    if preset_folder is not None:
+        fc200.PRESET_FOLDER = preset_folder
+    c_instance = CInstance(song)
+    return fc200.FC200(c_instance), c_instance, clock
+
+
+def frame(bank, pedal, value):
+    return module("SysExFrames").build_frame(bank, pedal, value)
+
+
+def press(script, pedal, value=127, release=True):
+    """ Sends a press of pedal, followed by its release unless it is the expression pedal """
+    script.handle_sysex(frame(0, pedal, value))
+    if value == 127 and release and pedal != 13:
+        script.handle_sysex(frame(0, pedal, 0))
+
+
+def tick(script, clock, ticks=1):
+    for _ in range(ticks):
+        clock.advance(TICK_SECONDS)
+        script.update_display()
+
+
+def sent_writes(c_instance):
+    """ The (bank, pedal, value) of every frame sent since the last call """
+    writes = [f[5:8] for f in c_instance.sent]
+    del c_instance.sent[:]
+    return writes
@@ -0,0 +1,95 @@
+"""
+Replays a recorded traffic log (see src/TrafficLog.py) into a headless FC200.
+
+The recorded incoming messages are fed to handle_sysex at their recorded
+times on the harness clock, with update_display ticking every 100 ms of
+recorded time in between, so a replay does what the session did. By default
+it runs as fast as possible; --realtime waits out the recorded gaps.
+
+    python headless/replay.py gig.fc2traffic --session -1
+
+Afterwards the frames the script sent are compared with the recorded ones.
+"""
+import argparse
+import time
+from collections import Counter
+
+import harness
+
+TRAFFIC = harness.module("TrafficLog")
+
+DRAIN_TICKS = 10    # ticks after the last message, for the output queue to empty
+
+
+class Replayer:
+    def __init__(self, records):
+        self.records = records
+        self.sent = []
+
+    def incoming(self):
+        return [(seconds, midi_bytes) for seconds, direction, midi_bytes in self.records if direction == TRAFFIC.IN]
+
+    def outgoing(self):
+        return [midi_bytes for _, direction, midi_bytes in self.records if direction == TRAFFIC.OUT]
+
+    def run(self, script, c_instance, clock, realtime=False, sleep=time.sleep):
+        """ Feeds the recorded messages into script, returns the frames it sent """
+        start = clock()
+        next_tick = harness.TICK_SECONDS
+        wall_start = time.perf_counter()
+        for seconds, midi_bytes in self.incoming():
+            while next_tick <= seconds:
+                self._tick(script, c_instance, clock, start + next_tick)
+                next_tick += harness.TICK_SECONDS
+            if realtime:
+                wait = seconds - (time.perf_counter() - wall_start)
+                if wait > 0:
+                    sleep(wait)
+            clock.now = start + seconds
+            script.handle_sysex(midi_bytes)
+        for _ in range(DRAIN_TICKS):
+            self._tick(script, c_instance, clock, start + next_tick)
+            next_tick += harness.TICK_SECONDS
+        return self.sent
+
+    def _tick(self, script, c_instance, clock, now):
+        clock.now = now
+        script.update_display()
+        self.sent += c_instance.sent
+        del c_instance.sent[:]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replays a recorded FC200 session into a headless script")
+    parser.add_argument("path")
+    parser.add_argument("--session", type=int, default=-1, help="index of the session in the log, -1 for the last")
+    parser.add_argument("--realtime", action="store_true", help="replay at the recorded speed")
+    args = parser.parse_args(argv)
+
+    sessions = TRAFFIC.read_sessions(args.path)
+    if not sessions:
+        parser.error("no sessions in %s" % args.path)
+    started, records = sessions[args.session]
+    replayer = Replayer(records)
+    incoming = replayer.incoming()
+    print(f"session started {time.ctime(started)}: {len(incoming)} messages in, "
+          f"{len(records) - len(incoming)} out over {records[-1][0] if records else 0:.1f} s")
+
+    script, c_instance, clock = harness.make_script()
+    wall = time.perf_counter()
+    sent = replayer.run(script, c_instance, clock, args.realtime)
+    wall = time.perf_counter() - wall
+    script.disconnect()
+
+    recorded = Counter(replayer.outgoing())
+    replayed = Counter(sent)
+    missing = sum((recorded - replayed).values())
+    extra = sum((replayed - recorded).values())
+    print(f"replayed in {wall:.3f} s ({len(incoming) / wall if wall else 0:,.0f} msg/s)")
+    print(f"frames out: recorded {sum(recorded.values())}, replayed {len(sent)}, "
+          f"{missing} missing, {extra} extra")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
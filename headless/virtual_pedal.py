@@ -0,0 +1,207 @@
+"""
+Python port of virtual-pedal/FC200_virtual-pedal.maxpat.
+
+VirtualFC200 builds the DT1 frames the FC-200 sends for pedal presses,
+releases and the expression pedal, and decodes the LED and display frames
+the script sends back into the state the board would show.
+
+Run as a script it is a load generator: it drives a headless FC200 with
+page flips and a continuous expression sweep, e.g.
+
+    python headless/virtual_pedal.py --page-flips 100 --expression-rate 200
+
+and reports how long handle_sysex and update_display took.
+"""
+import argparse
+import time
+
+import harness
+
+FRAMES = harness.module("SysExFrames")
+HEADER = FRAMES.HEADER
+END = FRAMES.END
+LED_BANK = FRAMES.LED_BANK
+DISPLAY_BANK = FRAMES.DISPLAY_BANK
+LED_PEDALS = FRAMES.LED_PEDALS
+DISPLAY_DIGITS = FRAMES.DISPLAY_DIGITS
+checksum = FRAMES.checksum
+build_frame = FRAMES.build_frame
+
+PRESS_BANK = 0
+PEDALS = 10         # pedals 1-10 are addresses 0-9
+BANK_UP = 10
+BANK_DOWN = 11
+CTL = 12
+EXPRESSION = 13
+
+PRESS = 127
+RELEASE = 0
+
+# Segments back to characters, digits win where a letter looks the same (5/S, 2/Z)
+SEGMENT_CHARACTERS = {}
+for _character, _segments in sorted(harness.module("SegmentEncoder").SegmentEncoder.MAP.items(),
+                                    key=lambda item: not item[0].isdigit()):
+    SEGMENT_CHARACTERS.setdefault(_segments, _character)
+
+
+def decode(midi_bytes):
+    """ (bank, pedal, value) of a DT1 frame, None if it is not one """
+    if len(midi_bytes) != 10 or tuple(midi_bytes[:5]) != HEADER or midi_bytes[9] != END:
+        return None
+    bank, pedal, value = midi_bytes[5:8]
+    if midi_bytes[8] != checksum(bank, pedal, value):
+        return None
+    return bank, pedal, value
+
+
+class VirtualFC200:
+    """
+    The board side of the conversation. Frames for the script go to
+    send(midi_bytes), frames from the script are passed to receive().
+    """
+
+    def __init__(self, send):
+        self._send = send
+        self.leds = [0] * LED_PEDALS
+        self.digits = [0] * DISPLAY_DIGITS
+        self.held = set()
+        self.expression_value = 0
+        self.sent = 0
+        self.received = 0
+        self.invalid = 0
+
+    def press(self, pedal):
+        self.held.add(pedal)
+        self._send_frame(PRESS_BANK, pedal, PRESS)
+
+    def release(self, pedal):
+        self.held.discard(pedal)
+        self._send_frame(PRESS_BANK, pedal, RELEASE)
+
+    def tap(self, pedal):
+        self.press(pedal)
+        self.release(pedal)
+
+    def bank_up(self):
+        self.tap(BANK_UP)
+
+    def bank_down(self):
+        self.tap(BANK_DOWN)
+
+    def expression(self, value):
+        self.expression_value = value
+        self._send_frame(PRESS_BANK, EXPRESSION, value)
+
+    def receive(self, midi_bytes):
+        self.received += 1
+        decoded = decode(midi_bytes)
+        if decoded is None:
+            self.invalid += 1
+            return
+        bank, pedal, value = decoded
+        if bank == LED_BANK and pedal < LED_PEDALS:
+            self.leds[pedal] = value
+        elif bank == DISPLAY_BANK and pedal < DISPLAY_DIGITS:
+            self.digits[pedal] = value
+        else:
+            self.invalid += 1
+
+    def display(self):
+        """ The display as text, '?' for segments that are no known character """
+        return "".join(SEGMENT_CHARACTERS.get(segments, "?") for segments in self.digits)
+
+    def lit(self):
+        return [pedal for pedal, value in enumerate(self.leds) if value]
+
+    def _send_frame(self, bank, pedal, value):
+        self.sent += 1
+        self._send(build_frame(bank, pedal, value))
+
+
+def sweep(rate, seconds, low=0, high=127):
+    """ Expression values rising and falling between low and high, rate values a second """
+    span = high - low
+    for i in range(int(rate * seconds)):
+        position = i % (2 * span)
+        yield low + (position if position <= span else 2 * span - position)
+
+
+class LoadGenerator:
+    """
+    Feeds a scripted load into a headless script one tick at a time: page
+    flips every flip_ticks ticks, alternating up and down, and expression
+    values at expression_rate messages a second in between. Every frame
+    the script sends is decoded by the virtual board.
+    """
+
+    def __init__(self, script, c_instance, clock):
+        self._script = script
+        self._c_instance = c_instance
+        self._clock = clock
+        self.board = VirtualFC200(self._handle)
+        self.sysex_seconds = []
+        self.tick_seconds = []
+
+    def run(self, page_flips=100, expression_rate=200, flip_ticks=5, seconds=None):
+        ticks = page_flips * flip_ticks
+        if seconds is not None:
+            ticks = max(ticks, int(seconds / harness.TICK_SECONDS))
+        values = sweep(expression_rate, ticks * harness.TICK_SECONDS)
+        per_tick = expression_rate * harness.TICK_SECONDS
+        due = 0.0
+        flips = 0
+        for t in range(ticks):
+            if flips < page_flips and t % flip_ticks == 0:
+                self.board.bank_up() if flips % 2 == 0 else self.board.bank_down()
+                flips += 1
+            due += per_tick
+            while due >= 1:
+                self.board.expression(next(values, 0))
+                due -= 1
+            start = time.perf_counter()
+            harness.tick(self._script, self._clock)
+            self.tick_seconds.append(time.perf_counter() - start)
+            for midi_bytes in self._c_instance.sent:
+                self.board.receive(midi_bytes)
+            del self._c_instance.sent[:]
+        return flips
+
+    def _handle(self, midi_bytes):
+        start = time.perf_counter()
+        self._script.handle_sysex(midi_bytes)
+        self.sysex_seconds.append(time.perf_counter() - start)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drives a headless FC200 script with a virtual FC-200")
+    parser.add_argument("--page-flips", type=int, default=100)
+    parser.add_argument("--expression-rate", type=float, default=200, help="expression messages per second")
+    parser.add_argument("--flip-ticks", type=int, default=5, help="ticks between page flips")
+    parser.add_argument("--seconds", type=float, help="run at least this long in script time")
+    args = parser.parse_args(argv)
+
+    script, c_instance, clock = harness.make_script()
+    load = LoadGenerator(script, c_instance, clock)
+    start = time.perf_counter()
+    flips = load.run(args.page_flips, args.expression_rate, args.flip_ticks, args.seconds)
+    elapsed = time.perf_counter() - start
+
+    board = load.board
+    print(f"{flips} page flips, {board.sent} frames in, {board.received} frames out "
+          f"in {len(load.tick_seconds)} ticks ({elapsed:.2f} s wall)")
+    for label, samples in (("handle_sysex", load.sysex_seconds), ("update_display", load.tick_seconds)):
+        print(f"{label:15} p50 {percentile(samples, 0.5) * 1e6:8.1f} us  p99 {percentile(samples, 0.99) * 1e6:8.1f} us"
+              f"  max {max(samples) * 1e6:8.1f} us")
+    print(f"board shows page {board.display().strip()!r}, script is on page {script._page.number}, "
+          f"{board.invalid} invalid frames")
+    script.disconnect()
+    return 0 if board.invalid == 0 and board.display().strip() == str(script._page.number) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+import time
+
+
+class Pattern:
+    """
+    An LED animation as (value, seconds) steps. A repeating pattern loops
+    forever, any other pattern ends after its last step.
+    """
+
+    __slots__ = ("steps", "repeat", "length")
+
+    def __init__(self, steps, repeat=False):
+        self.steps = tuple(steps)
+        self.repeat = repeat
+        self.length = sum(duration for _, duration in self.steps)
+
+    def value_at(self, elapsed):
+        """ The LED value elapsed seconds into the pattern, None once it has ended """
+        if self.repeat:
+            elapsed %= self.length
+        elif elapsed >= self.length:
+            return None
+        for value, duration in self.steps:
+            if elapsed < duration:
+                return value
+            elapsed -= duration
+        return self.steps[-1][0]
+
+
+def flash(seconds=0.1, value=127):
+    return Pattern(((value, seconds),))
+
+
+def one_shot(*steps):
+    return Pattern(steps)
+
+
+def blink(period=1.0, value=127):
+    return Pattern(((value, period / 2.0), (0, period / 2.0)), repeat=True)
+
+
+def pulse(period=1.0, width=0.1, value=127):
+    return Pattern(((value, width), (0, period - width)), repeat=True)
+
+
+def hold(value=127):
+    return Pattern(((value, 1.0),), repeat=True)
+
+
+class AnimationEngine:
+    """
+    Runs the LED patterns of all pedals from one tick.
+
+    A pedal plays at most one pattern, playing another replaces it. Patterns
+    start when they are played, except that a repeating pattern joins the
+    phase of other pedals already playing it, so everything that blinks
+    blinks together. The first frame of a pattern is written right away,
+    after that tick() computes a frame for every animated pedal and writes
+    only the LEDs whose value changed. When a pattern ends or is stopped the
+    pedal goes back to rest(pedal), the value it shows when nothing animates
+    it.
+    """
+
+    def __init__(self, write, rest, clock=time.monotonic):
+        self._write = write
+        self._rest = rest
+        self._clock = clock
+        self._animations = {}
+        self._shown = {}
+
+    def play(self, pedal, pattern):
+        now = self._clock()
+        start = now
+        if pattern.repeat:
+            for playing, playing_start in self._animations.values():
+                if playing is pattern:
+                    start = playing_start
+                    break
+        self._animations[pedal] = (pattern, start)
+        self._show(pedal, pattern.value_at(now - start))
+
+    def stop(self, pedal, restore=True):
+        if self._animations.pop(pedal, None) is None:
+            return
+        self._shown.pop(pedal, None)
+        if restore:
+            self._write(pedal, self._rest(pedal))
+
+    def stop_all(self, restore=True):
+        for pedal in list(self._animations):
+            self.stop(pedal, restore)
+
+    def is_playing(self, pedal):
+        return pedal in self._animations
+
+    def active_count(self):
+        return len(self._animations)
+
+    def redraw(self):
+        """ Writes the current frame of every animated pedal again, for hardware that lost its state """
+        self._shown.clear()
+        self.tick()
+
+    def tick(self):
+        if not self._animations:
+            return
+        now = self._clock()
+        for pedal, (pattern, start) in list(self._animations.items()):
+            value = pattern.value_at(now - start)
+            if value is None:
+                self.stop(pedal)
+            else:
+                self._show(pedal, value)
+
+    def _show(self, pedal, value):
+        if self._shown.get(pedal) != value:
+            self._shown[pedal] = value
+            self._write(pedal, value)
@@ -0,0 +1,159 @@
+TRACK = 0
+RACK = 1
+BOARD = 2
+DEVICES = 3
+
+
+def matches(device, name):
+    """ True if the device is called name or carries it as a [name] tag """
+    device_name = device.name
+    return device_name == name or ("[%s]" % name) in device_name
+
+
+class BoardResolver:
+    """
+    Finds the pedal board and its devices and caches the handles.
+
+    The board is the first chain of the board rack on the board track. The
+    track and rack are looked up by name when track_name and rack_name are
+    given, otherwise the first track and its first device are used. Devices
+    are addressed by the board index used in LOOP_MAPPING and presets; an
+    index listed in device_names is found by device name or [tag] anywhere on
+    the board. Any other index is the device at that position when the board
+    is found, and keeps following that device when devices are added, moved
+    or removed around it; if the device itself is removed the index is left
+    empty, with a warning.
+
+    Listeners on the song's tracks, the track's devices, the rack's chains,
+    the board's devices and, when names are used, the device names mark the
+    changed level dirty. It is resolved again, along with everything below
+    it, on the next refresh(); on_changed is called afterwards so the script
+    can rebind its handles. The accessors never resolve, they return the
+    handles of the last refresh, so on_changed can only run where the
+    script calls refresh() and never in the middle of a pedal handler.
+    """
+
+    def __init__(self, song, registry, track_name=None, rack_name=None, device_names=None, on_changed=None, log=None):
+        self._song = song
+        self._registry = registry
+        self._track_name = track_name
+        self._rack_name = rack_name
+        self._device_names = dict(device_names or {})
+        self._on_changed = on_changed
+        self._log = log
+        self._track = None
+        self._rack = None
+        self._board = None
+        self._board_devices = ()
+        self._bound = {}
+        self._devices = {}
+        self._dirty = None
+        self._callbacks = [lambda level=level: self._mark(level) for level in range(DEVICES + 1)]
+        registry.add(song, "tracks", self._callbacks[TRACK], "board")
+        self._resolve(TRACK)
+
+    @property
+    def track(self):
+        return self._track
+
+    @property
+    def board(self):
+        return self._board
+
+    def device(self, index):
+        """ The device at a board index, or None if it cannot be found """
+        try:
+            return self._devices[index]
+        except KeyError:
+            device = self._devices[index] = self._find_device(index)
+            return device
+
+    def refresh(self):
+        """ Resolves what changed since the last refresh, returns True if anything did """
+        if self._dirty is None:
+            return False
+        level = self._dirty
+        self._dirty = None
+        self._resolve(level)
+        if self._log is not None:
+            self._log.debug("Board resolved again from level %d: %d devices", level, len(self._board_devices))
+        if self._on_changed is not None:
+            self._on_changed()
+        return True
+
+    def disconnect(self):
+        self._forget(TRACK)
+        self._registry.clear("board")
+
+    def _mark(self, level):
+        if self._dirty is None or level < self._dirty:
+            self._dirty = level
+
+    def _resolve(self, level):
+        self._forget(level)
+        if level <= TRACK:
+            self._track = self._find(self._song.tracks, self._track_name, "track")
+            self._observe(TRACK, self._track, "devices", RACK)
+        if level <= RACK:
+            self._rack = None
+            if self._track is not None:
+                self._rack = self._find(self._track.devices, self._rack_name, "board rack")
+            self._observe(RACK, self._rack, "chains", BOARD)
+        if level <= BOARD:
+            self._board = None
+            if self._rack is not None and self._rack.can_have_chains and len(self._rack.chains):
+                self._board = self._rack.chains[0]
+            self._observe(BOARD, self._board, "devices", DEVICES)
+        self._board_devices = tuple(self._board.devices) if self._board is not None else ()
+        if level <= BOARD:
+            self._bound = dict(enumerate(self._board_devices))
+        else:
+            self._follow_bound()
+        self._devices = {}
+        if self._device_names:
+            for device in self._board_devices:
+                self._observe(DEVICES, device, "name", DEVICES)
+
+    def _find(self, items, name, what):
+        items = tuple(items)
+        if name is None:
+            return items[0] if items else None
+        for item in items:
+            if matches(item, name):
+                return item
+        # The script cannot run without a track and rack, so fall back loudly
+        if self._log is not None:
+            self._log.warning("No %s named %s, using the first one", what, name)
+        return items[0] if items else None
+
+    def _find_device(self, index):
+        name = self._device_names.get(index)
+        if name is None:
+            if index not in self._bound:
+                if not 0 <= index < len(self._board_devices):
+                    return None
+                self._bound[index] = self._board_devices[index]
+            return self._bound[index]
+        for device in self._board_devices:
+            if matches(device, name):
+                return device
+        if self._log is not None:
+            self._log.warning("No board device named %s for index %d", name, index)
+        return None
+
+    def _follow_bound(self):
+        # "in" compares with ==, Live can hand out a new wrapper for the same device
+        for index, device in self._bound.items():
+            if device is not None and device not in self._board_devices:
+                self._bound[index] = None
+                if self._log is not None and index not in self._device_names:
+                    self._log.warning("Board device for index %d was removed", index)
+
+    def _observe(self, level, subject, name, dirty_level):
+        # Registered in a group per level, so a level can be dropped with everything below it
+        if subject is not None:
+            self._registry.add(subject, name, self._callbacks[dirty_level], ("board", level))
+
+    def _forget(self, level):
+        for observed in range(level, DEVICES + 1):
+            self._registry.clear(("board", observed))
@@ -0,0 +1,73 @@
+from .SysExFrames import frame_key
+
+MODE_NORMAL = 0
+MODE_FAVORITE = 1           # page 2, a favorite parameter follows the expression pedal
+MODE_PARAMETER = 2          # full parameter control of one board device
+MODE_PRESET_CONFIRM = 3     # page 0, waiting for a second press to overwrite a preset
+
+MODE_NAMES = {
+    MODE_NORMAL: "normal",
+    MODE_FAVORITE: "favorite parameter",
+    MODE_PARAMETER: "parameter control",
+    MODE_PRESET_CONFIRM: "preset overwrite",
+}
+
+ANY = 255   # matches every page or every value
+
+PRESS = 127
+RELEASE = 0
+
+
+def dispatch_key(mode, event):
+    return (mode << 32) | event
+
+
+class DispatchTable:
+    """
+    Maps (mode, page, bank, pedal, value) to a handler(pedal, value).
+
+    Rows are added with add() and compiled per page into a flat dict with
+    page_handlers(), so a page only pays for its own rows when it is first
+    used. A mode can inherit the rows of another mode for everything it does
+    not override, and ANY can be used for the page or the value; a row for a
+    specific page wins over an ANY page row. Resolving an event is at most two
+    dict lookups: the exact value, then the ANY value row.
+    """
+
+    def __init__(self):
+        self._rows = []
+        self._parents = {}
+
+    def add(self, mode, page, bank, pedal, value, handler):
+        self._rows.append((mode, page, bank, pedal, value, handler))
+
+    def add_presses(self, mode, page, pedals, handler):
+        for pedal in pedals:
+            self.add(mode, page, 0, pedal, PRESS, handler)
+
+    def inherit(self, mode, parent):
+        self._parents[mode] = parent
+
+    def page_handlers(self, page):
+        """ Compiles the rows for one page into {dispatch_key(mode, event): handler} """
+        rows = {}
+        for row_page in (ANY, page):
+            for mode, p, bank, pedal, value, handler in self._rows:
+                if p == row_page:
+                    rows.setdefault(mode, {})[frame_key(bank, pedal, value)] = handler
+
+        handlers = {}
+        for mode in set(rows) | set(self._parents):
+            own = dict(rows.get(mode, {}))
+            parent = self._parents.get(mode)
+            while parent is not None:
+                for key, handler in rows.get(parent, {}).items():
+                    # An ANY-value row of the child also hides the exact rows of the parent
+                    if key in own or (key | ANY) in own:
+                        continue
+                    own[key] = handler
+                parent = self._parents.get(parent)
+            for key, handler in own.items():
+                handlers[dispatch_key(mode, key)] = handler
+        return handlers
+
@@ -0,0 +1,58 @@
+import time
+
+
+class ExpressionCoalescer:
+    """
+    Merges expression pedal writes so every target (volume, favorite or
+    selected parameter) gets at most one Live API write per tick.
+
+    The first value after a quiet tick is written straight away so a sweep
+    starts without lag; values arriving after that are held and only the
+    latest one is written when flush() runs on the next tick. A target can
+    additionally be limited to a maximum number of writes per second.
+    """
+
+    def __init__(self, max_rate=None, clock=time.monotonic):
+        self._clock = clock
+        self._default_interval = 1.0 / max_rate if max_rate else 0.0
+        self._min_interval = {}
+        self._last_write = {}
+        self._written = set()
+        self._pending = {}
+
+    def set_max_rate(self, target, writes_per_second):
+        """ Limits a single target, None removes the limit """
+        self._min_interval[target] = 1.0 / writes_per_second if writes_per_second else 0.0
+
+    def submit(self, target, parameter, value):
+        if target not in self._written and self._write(target, parameter, value):
+            self._pending.pop(target, None)
+            return
+        self._pending[target] = (parameter, value)
+
+    def flush(self):
+        """ Writes the latest held value of every target, called once per tick """
+        self._written.clear()
+        if not self._pending:
+            return
+        for target, (parameter, value) in list(self._pending.items()):
+            if self._write(target, parameter, value):
+                del self._pending[target]
+
+    def discard(self, target):
+        """ Drops a held value, used when the target is unbound """
+        self._pending.pop(target, None)
+
+    def pending_count(self):
+        return len(self._pending)
+
+    def _write(self, target, parameter, value):
+        interval = self._min_interval.get(target, self._default_interval)
+        if interval:
+            now = self._clock()
+            if now - self._last_write.get(target, -interval) < interval:
+                return False
+            self._last_write[target] = now
+        parameter.value = value
+        self._written.add(target)
+        return True
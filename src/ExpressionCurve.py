@@ -0,0 +1,87 @@
+CURVE_LINEAR = "linear"
+CURVE_LOG = "log"       # audio taper, fine control at the heel
+CURVE_DB = "db"         # linear in dB between DB_FLOOR and 0 dB
+
+DB_FLOOR = -60.0
+
+_tables = {}
+
+
+def _shape(curve, x):
+    if curve == CURVE_LINEAR:
+        return x
+    if curve == CURVE_LOG:
+        return (10.0 ** (2.0 * x) - 1.0) / 99.0
+    if curve == CURVE_DB:
+        if x <= 0.0:
+            return 0.0
+        return 10.0 ** ((1.0 - x) * DB_FLOOR / 20.0)
+    if callable(curve):
+        return curve(x)
+    raise ValueError("Unknown expression curve: %r" % (curve,))
+
+
+def build_table(minimum, maximum, curve=CURVE_LINEAR, heel=0, toe=127, quantized=False):
+    """
+    Returns a 128-entry tuple mapping raw pedal values to parameter values.
+    heel and toe are the raw values the pedal really reaches at both ends.
+    curve is one of the CURVE_* names, a callable taking and returning 0.0-1.0,
+    or a custom sequence of 128 values between 0.0 and 1.0.
+    Tables are cached, so targets with the same range share one.
+    """
+    if not callable(curve) and not isinstance(curve, str):
+        curve = tuple(curve)
+        if len(curve) != 128:
+            raise ValueError("A custom curve needs 128 values")
+    key = (minimum, maximum, curve, heel, toe, quantized)
+    table = _tables.get(key)
+    if table is not None:
+        return table
+
+    span = float(max(1, toe - heel))
+    values = []
+    for raw in range(128):
+        x = min(1.0, max(0.0, (raw - heel) / span))
+        if isinstance(curve, tuple):
+            y = curve[int(round(x * 127))]
+        else:
+            y = _shape(curve, x)
+        value = minimum + (maximum - minimum) * min(1.0, max(0.0, y))
+        values.append(round(value) if quantized else value)
+    table = _tables[key] = tuple(values)
+    return table
+
+
+class ExpressionMap:
+    """
+    Maps raw pedal values onto one parameter through a lookup table, with a
+    hysteresis band: after the pedal stops, moving back by hysteresis raw steps
+    or less is treated as jitter and dropped.
+    """
+
+    def __init__(self, parameter, curve=CURVE_LINEAR, heel=0, toe=127, hysteresis=0):
+        self.parameter = parameter
+        self.table = build_table(parameter.min, parameter.max, curve, heel, toe,
+                                 getattr(parameter, "is_quantized", False))
+        self._hysteresis = hysteresis
+        self._last_raw = None
+        self._last_value = None
+        self._direction = 0
+
+    def map(self, raw):
+        """ Returns the parameter value for raw, or None if nothing should be written """
+        last = self._last_raw
+        if last is not None:
+            delta = raw - last
+            if delta == 0:
+                return None
+            direction = 1 if delta > 0 else -1
+            if direction != self._direction and -self._hysteresis <= delta <= self._hysteresis:
+                return None
+            self._direction = direction
+        self._last_raw = raw
+        value = self.table[raw]
+        if value == self._last_value:
+            return None
+        self._last_value = value
+        return value
@@ -17,47 +17,104 @@ from .SpecialSessionComponent import SpecialSessionComponent
 from .SpecialZoomingComponent import SpecialZoomingComponent
 from .SpecialViewControllerComponent import DetailViewControllerComponent
 from .MIDI_Map import *
-from .SegmentEncoder import SegmentEncoder
+from .SysExFrames import LED_BANK, DISPLAY_BANK, LED_PEDALS
+from .Dispatch import *
+from .SysExParser import parse, parse_batch, INVALID, FRAME_LENGTH
+from .Log import RingLog, INFO
+from .ExpressionCoalescer import ExpressionCoalescer
+from .ExpressionCurve import ExpressionMap, CURVE_LINEAR, CURVE_LOG, CURVE_DB
+from .PresetStore import PresetStore
+from .PresetWriter import PresetWriter
+from .PresetPlan import PresetCompiler
+from .SceneIndex import SceneIndex
+from .BoardResolver import BoardResolver
+from .Page import Page, Pages
+from .Animation import AnimationEngine, flash, blink, hold
+from .Scheduler import DeadlineScheduler
+from .TextRenderer import TextRenderer
+from .TrafficLog import TrafficRecorder, TrafficLogError, IN, OUT
+from .Stats import LatencyStats, RateCounter
+from .ListenerRegistry import ListenerRegistry
+from .MidiOutQueue import MidiOutQueue, PRIORITY_FEEDBACK, PRIORITY_NORMAL, PRIORITY_BULK, FC200_BYTES_PER_SECOND
 import os
-import json
+import time
+from collections import OrderedDict
 
 
 MIN_PAGE = 0
 MAX_PAGE = 2
 LOOP_MAPPING = [0, 1, 2, 3, 4, 6, 7, 8, 9]
 LOOP_VOLUME = 5 
+BOARD_TRACK = None              # name of the track holding the board rack, None for the first track
+BOARD_RACK = None               # name of the board rack on that track, None for its first device
+BOARD_DEVICES = {}              # board index -> device name or [tag], e.g. {5: "Volume"}, others follow the device found at that position
 FAVORITE_PARAMETERS = [1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
+PRESET_FOLDER = os.path.dirname("/Users/ljvdhooft/Music/Ableton/User Library/eGit presets/")
+PRESET_CACHE_SIZE = 256         # presets kept in memory
+PRESET_RESCAN_SECONDS = 5.0     # how often the preset folder is checked for changes
+PRESET_BANK = "presets.fc2bank" # packed bank in the preset folder, used if present (see PresetBank.py)
+PREPARED_PRESETS = 4            # prefetched presets ready to apply
+MIDI_OUT_BYTES_PER_SECOND = FC200_BYTES_PER_SECOND
+EXPRESSION_HEEL = 0             # raw value the expression pedal sends fully up
+EXPRESSION_TOE = 127            # raw value the expression pedal sends fully down
+EXPRESSION_HYSTERESIS = 1       # reversals of this many raw steps or less are jitter
+VOLUME_CURVE = CURVE_LINEAR     # CURVE_LINEAR, CURVE_LOG, CURVE_DB, a callable or 128 values
+PARAMETER_CURVE = CURVE_LINEAR
+EXPRESSION_MAX_RATE = None      # max Live API writes per second per expression target, None for once per tick
+EXPRESSION_TARGET_RATES = {}    # overrides per target ("volume", "favorite", "parameter"), e.g. {"volume": 30}
+LOG_LEVEL = INFO               # written to Live's Log.txt
+LOG_CAPTURE_LEVEL = INFO       # kept in the ring buffer; MIDI traffic is recorded with TRAFFIC_LOG instead
+LOG_RING_SIZE = 256
+LOG_DUMP_COMBO = None          # pedals pressed together to dump the ring buffer, e.g. (10, 11), None to disable
+FLASH_SECONDS = 0.1            # LED flash confirming a press
+BLINK_SECONDS = 1.0            # full on/off period of blinking LEDs
+PARAMETER_PEDALS = (0, 1, 2, 3, 5, 6, 7, 8)    # pedals selecting a macro in parameter control
+MARQUEE_TICKS = 3              # ticks each step of scrolling display text is shown
+CLOCK = time.monotonic         # seconds for rate limits, animations and log records
+TRAFFIC_LOG = None             # file to record all MIDI in and out to (see TrafficLog.py), None to not record
 
 class FC200(ControlSurface):
     def __init__(self, c_instance):
         super(FC200, self).__init__(c_instance)
 
-        self._page = 1
-        self._track = self.song().tracks[0]
-        self._board = self._track.devices[0].chains[0]
-
-        self._led_status = {}
-        for p in range(MIN_PAGE, MAX_PAGE + 1):
-            self._led_status[p] = {}
-        self.display(1, "")
-        self.display(0, self._page)
-
+        self._log = RingLog(self.log_message, LOG_LEVEL, LOG_CAPTURE_LEVEL, LOG_RING_SIZE, CLOCK)
+        self._registry = ListenerRegistry(self._log)
+        self._traffic = self._open_traffic_log()
+        self._latency = LatencyStats()
+        self._rate_in = RateCounter(CLOCK)
+        self._rate_out = RateCounter(CLOCK)
+        self._held_pedals = set()
+        self._midi_out = MidiOutQueue(self._send_frame, MIDI_OUT_BYTES_PER_SECOND, clock=CLOCK)
+        self._animations = AnimationEngine(self._animation_frame, self._rest_led, CLOCK)
+        self._flash = flash(FLASH_SECONDS)
+        self._blink = blink(BLINK_SECONDS)
+        self._hold = hold()
+        self._scheduler = DeadlineScheduler()
+        self._display_text = TextRenderer(self._display_digit, self._scheduler, step_ticks=MARQUEE_TICKS)
+        self._expression = ExpressionCoalescer(EXPRESSION_MAX_RATE, CLOCK)
+        for target, rate in EXPRESSION_TARGET_RATES.items():
+            self._expression.set_max_rate(target, rate)
+        self._expression_maps = {}
+        self._presets = PresetStore(PRESET_FOLDER, PRESET_CACHE_SIZE, PRESET_RESCAN_SECONDS, self._log,
+                                    PRESET_BANK)
+        self._presets.start()
+        self._preset_writer = PresetWriter(self._log)
+        self._preset_writer.start()
+        self._board_resolver = BoardResolver(self.song(), self._registry, BOARD_TRACK, BOARD_RACK, BOARD_DEVICES,
+                                             self._on_board_changed, self._log)
+        self._track = self._board_resolver.track
+        self._preset_compiler = PresetCompiler(self._board_resolver, self._registry, self._log)
 
         # Add listeners for page_0 (is_playing, metronome)
-        if not self.song().is_playing_has_listener(self._on_is_playing_changed):
-            self.log_message(f"Adding listener for is_playing")
-            self.song().add_is_playing_listener(self._on_is_playing_changed)
-            self._led_status[0][0] = 127 if self.song().is_playing else 0
-        if not self.song().metronome_has_listener(self._on_metronome_changed):
-            self.log_message(f"Adding listener for metronome state")
-            self.song().add_metronome_listener(self._on_metronome_changed)
-            self._led_status[0][5] = 127 if self.song().metronome else 0
-
-        if not self._track.playing_slot_index_has_listener(self._load_preset):
-            self._track.add_playing_slot_index_listener(self._load_preset)
+        self._registry.add(self.song(), "is_playing", self._on_is_playing_changed)
+        self._registry.add(self.song(), "metronome", self._on_metronome_changed)
+
+        # Prefetch the preset of the clip that is about to be launched
+        self._prepared_presets = OrderedDict()
+        self._watch_track()
+        self._scenes = SceneIndex(self.song(), self._registry, self._on_selected_scene_changed, self._log)
         
-        self._preset_store_confirm = None
-        self._preset_store_blinking_led = None
+        self._mode = MODE_NORMAL
         self._favorite_parameter = None
         self._favorite_parameter_pedal = None
         self._parameter_control = None
@@ -67,390 +124,480 @@ class FC200(ControlSurface):
         self._parameter_control_chains = None
         self._parameter_control_selected_chain = None
         self._parameter_control_selected_chain_index = None
-        self._parameter_control_blink = None
-        self._observed_params = []
+        self._mode_exits = {
+            MODE_FAVORITE: self._exit_favorite_parameter,
+            MODE_PARAMETER: self._exit_parameter_control,
+            MODE_PRESET_CONFIRM: self._exit_preset_confirm,
+        }
+        self._dispatch = self._build_dispatch()
+        self._bind_volume()
         self._listeners()
-        self.leds_off()
-        self._init_leds()
+        self._pages = Pages(self._build_page)
+        self._page = self._pages.get(1)
+        self.display(self._page.number)
         self.leds_recall()
+        self._on_selected_scene_changed()
 
         # Log to the Ableton Log.txt file
-        self.log_message("--- FC200 Script Loaded ---")
-
-    def _store_preset(self):
-        if self._preset_store_confirm is not None and not self._preset_store_confirm:
-            self.log_message("Overwrite!")
-            self._preset_store_confirm = True
-
-        def check_preset_exists(preset_file_path):
-            if os.path.exists(preset_file_path):
-                return True
-            return False
+        self._log.info("--- FC200 Script Loaded ---")
 
+    def _store_preset(self, confirmed=False):
         def clip_slot_name():
-            all_scenes = list(self.song().scenes)
-            selected_scene = self.song().view.selected_scene
-            selected_scene_index = all_scenes.index(selected_scene)
-            clip_slot = self._track.clip_slots[selected_scene_index]
+            if self._scenes.index < 0:
+                return None
+            clip_slot = self._track.clip_slots[self._scenes.index]
             if not clip_slot.has_clip:
                 return None
             return clip_slot.clip.name
         def get_parameter_values_for_preset():
             preset = {}
             for d in LOOP_MAPPING:
+                device = self._board_resolver.device(d)
+                if device is None:
+                    continue
                 preset[d] = {"parameters": []}
-                device = self._board.devices[d]
                 for i in range(0, 8):
                     parameter = device.parameters[i]
                     preset[d]["parameters"].append(parameter.value)
                 selected_chain = device.view.selected_chain
                 preset[d]["chain"] = selected_chain.name
             return preset
-        def store_preset(preset, path, name):
-            try:
-                with open(path, 'w') as f:
-                    preset_dict = json.dumps(preset, indent=2)
-                    f.write(preset_dict)
-                    self.log_message("saved preset file " + preset_file_path)
-                    self.show_message("Saved preset: " + name)
-            except Exception as e:
-                self.log_message("Error reading preset file: " + str(e))
-
-            return
+        def preset_stored(name, preset, mtime, error):
+            # Runs on the main thread once the writer thread is done
+            if error is not None:
+                self._log.error("Error writing preset file %s: %s", name, error)
+                self.show_message("Could not save preset: " + name)
+                return
+            self._presets.put(name, preset, mtime)
+            self._log.info("saved preset file %s", name)
+            self.show_message("Saved preset: " + name)
+            if confirmed:
+                self.flash_led(7)
 
         if clip_slot_name() is None:
             self.show_message('No clip on selected slot')
             return
         clip_name = clip_slot_name()
 
-        preset_folder = os.path.dirname("/Users/ljvdhooft/Music/Ableton/User Library/eGit presets/")
-        if not os.path.exists(preset_folder):
-            return None
-
         preset_file_name = "{}.json".format(clip_name)
-        preset_file_path = os.path.join(preset_folder, preset_file_name)
-
-        if check_preset_exists(preset_file_path) and self._preset_store_confirm is None:
-            self._preset_store_confirm = False
-            self.blink_led_value = 127
-            self._preset_store_blinking_led = self._tasks.add(Task.loop(Task.sequence(Task.wait(0.5), Task.run(lambda: self.blink_led(7)))))
-            self.log_message("Confirm to overwrite")
+        preset_file_path = os.path.join(PRESET_FOLDER, preset_file_name)
+
+        # Known from the preset store's scan, the file system is not touched here
+        exists = self._presets.contains(clip_name) or self._preset_writer.is_pending(preset_file_path)
+        if exists and not confirmed:
+            self._set_mode(MODE_PRESET_CONFIRM)
+            self._animations.play(7, self._blink)
+            self._log.debug("Confirm to overwrite")
             self.show_message(f"Overwrite reset {clip_name} ?")
             return
-        else:
-            self._preset_store_confirm = True
 
         preset = get_parameter_values_for_preset()
-        store_preset(preset, preset_file_path, clip_name)
-        if self._preset_store_blinking_led is not None:
-            self.flash_led(7)
-            self._preset_store_blinking_led.kill()
-            self._preset_store_blinking_led = None
-
-    def _load_preset(self):
-        def load_preset(clip_name):
-            preset_folder = os.path.dirname("/Users/ljvdhooft/Music/Ableton/User Library/eGit presets/")
-            preset_file_name = "{}.json".format(clip_name)
-            preset_file_path = os.path.join(preset_folder, preset_file_name)
-
-            if not os.path.exists(preset_file_path):
-                return None
-
-            try:
-                with open(preset_file_path, 'r') as f:
-                    data = f.read()
-                    preset_dict = json.loads(data)
-                    return preset_dict
-            except Exception as e:
-                self.log_message("Error reading preset file: " + str(e))
-
-        def apply_preset(preset):
-            for device in preset:
-                d = preset[device]
-                parameters = d['parameters']
-                for p, v in enumerate(parameters):
-                    parameter = self._board.devices[int(device)].parameters[int(p)]
-                    if not parameter.is_enabled:
-                        continue
-                    parameter.value = v
-                if "chain" in d:
-                    chains = self._board.devices[int(device)].chains
-                    for c in chains:
-                        if c.name == d["chain"]:
-                            self._board.devices[int(device)].view.selected_chain = c
-                            break 
-            return
+        self._preset_writer.save(preset_file_path, clip_name, preset, preset_stored)
+        if self._mode == MODE_PRESET_CONFIRM:
+            self._set_mode(MODE_NORMAL)
+
+    def _exit_preset_confirm(self):
+        self._animations.stop(7)
+
+    def _apply_preset(self, plan):
+        start = time.perf_counter()
+        written, skipped = plan.apply()
+        self._latency.record("preset apply", time.perf_counter() - start)
+        self._log.info("Preset applied: %d writes, %d unchanged", written, skipped)
+        return
 
+    def _playing_clip_name(self):
         slot = self._track.playing_slot_index
         if slot < 0:
+            return None
+        return self._track.clip_slots[slot].clip.name
+
+    def _load_preset(self):
+        clip_name = self._playing_clip_name()
+        if clip_name is None:
             return
-        clip_name = self._track.clip_slots[slot].clip.name
-        self.log_message(clip_name)
-        preset = load_preset(clip_name)
-        if preset is None:
+        self._log.debug("Playing clip %s", clip_name)
+        prepared = self._prepared(clip_name)
+        if prepared is not None:
+            self._schedule_apply_preset(prepared)
             return
-        self._tasks.add(Task.run(lambda: apply_preset(preset)))
-
-    def _send_sysex(self, body):
-        sysex_msg = (
-                240, 
-                65, 
-                0,
-                114,
-                18,
-                body[0],
-                body[1],
-                body[2],
-                self._checksum(body),
-                247
-            )
-        self.log_message(f"\nsending out: {sysex_msg}")
-        self._send_midi(sysex_msg)
-        return
+        # Resolved from memory; a preset that is still being read is applied from poll()
+        self._presets.request(clip_name, lambda preset: self._apply_loaded_preset(clip_name, preset))
 
-    def _checksum(self, body):
-        return (128 - ((body[0] + body[1] + body[2]) % 128)) % 128
+    def _apply_loaded_preset(self, clip_name, preset):
+        # Another clip may have started while the preset was read
+        if self._playing_clip_name() != clip_name:
+            self._log.debug("Preset %s loaded after its clip stopped playing", clip_name)
+            return
+        self._schedule_apply_preset(self._prepare_preset(clip_name, preset))
 
-    def display(self, number, character):
-        binary = SegmentEncoder.get_segments(character)
-        self._send_sysex([2, number, binary])
+    def _schedule_apply_preset(self, prepared):
+        self._tasks.add(Task.run(lambda: self._apply_preset(prepared)))
 
-    def leds_off(self):
+    def _prepared(self, clip_name):
+        # A plan is only valid for the preset and rack structure it was compiled from
+        entry = self._prepared_presets.get(clip_name)
+        preset = self._presets.get(clip_name)
+        if preset is None:
+            return None
+        if entry is not None and entry[0] is preset and entry[1] == self._preset_compiler.generation:
+            return entry[2]
+        return self._prepare_preset(clip_name, preset)
+
+    def _prepare_preset(self, clip_name, preset):
+        # Compiles a preset as stored on disk into a flat plan of parameter writes
+        rows = []
+        for device in preset:
+            d = preset[device]
+            rows.append((int(device), d['parameters'], d.get("chain")))
+        plan = self._preset_compiler.compile(rows)
+        self._prepared_presets[clip_name] = (preset, self._preset_compiler.generation, plan)
+        self._prepared_presets.move_to_end(clip_name)
+        while len(self._prepared_presets) > PREPARED_PRESETS:
+            self._prepared_presets.popitem(last=False)
+        return plan
+
+    def _prefetch_preset(self, slot):
+        if slot < 0 or slot >= len(self._track.clip_slots):
+            return
+        clip_slot = self._track.clip_slots[slot]
+        if not clip_slot.has_clip:
+            return
+        clip_name = clip_slot.clip.name
+        if self._prepared(clip_name) is not None:
+            return
+        self._log.debug("Prefetching preset %s", clip_name)
+        self._presets.request(clip_name, lambda preset: self._prepare_preset(clip_name, preset))
+
+    def _on_selected_scene_changed(self):
+        self._prefetch_preset(self._scenes.index)
+
+    def _on_fired_slot_index_changed(self):
+        self._prefetch_preset(self._track.fired_slot_index)
+
+    def _watch_track(self):
+        self._registry.clear("track")
+        self._registry.add(self._track, "playing_slot_index", self._load_preset, "track")
+        self._registry.add(self._track, "fired_slot_index", self._on_fired_slot_index_changed, "track")
+
+    def _on_board_changed(self):
+        # The board was edited: drop every handle taken from the old layout
+        self._set_mode(MODE_NORMAL)
+        track = self._board_resolver.track
+        if track != self._track:
+            self._track = track
+            self._watch_track()
+        self._preset_compiler.invalidate()
+        self._listeners()
+        page = self._pages.built(1)
+        if page is not None:
+            self._init_leds(page)
+        self.leds_recall()
+        self._bind_volume()
+        self._log.info("Board layout changed, pedals rebound")
+
+    def _check_log_dump(self, pedal, value):
+        # Returns True when this press completes the dump combo and is consumed;
+        # the pedals pressed before it act on their press as usual
+        if not value:
+            self._held_pedals.discard(pedal)
+            return False
+        self._held_pedals.add(pedal)
+        if len(self._held_pedals) < len(LOG_DUMP_COMBO):
+            return False
+        self.show_message("Dumped %d log records" % self._log.dump())
+        self._log_stats()
+        return True
+
+    def _log_stats(self):
+        self._log.info("MIDI in %.1f msg/s (peak %.1f, %d total), out %.1f msg/s (peak %.1f, %d total)",
+                       self._rate_in.rate, self._rate_in.peak, self._rate_in.total + self._rate_in.count,
+                       self._rate_out.rate, self._rate_out.peak, self._rate_out.total + self._rate_out.count)
+        self._log.info("Scheduler: %d callbacks waiting", self._scheduler.active_count())
+        for line in self._latency.summary():
+            self._log.info("Latency %s", line)
+
+    def _send_frame(self, frame):
+        self._rate_out.count += 1
+        if self._traffic is not None:
+            self._traffic.record(OUT, frame)
+        self._send_midi(frame)
+
+    def _open_traffic_log(self):
+        if TRAFFIC_LOG is None:
+            return None
+        try:
+            recorder = TrafficRecorder(TRAFFIC_LOG, CLOCK, self._log)
+        except (OSError, TrafficLogError) as e:
+            self._log.warning("Cannot record MIDI traffic to %s: %s", TRAFFIC_LOG, e)
+            return None
+        self._log.info("Recording MIDI traffic to %s", TRAFFIC_LOG)
+        return recorder
+
+    def update_display(self):
+        self._board_resolver.refresh()
+        self._presets.poll()
+        self._preset_writer.poll()
+        pending = self._expression.pending_count()
+        start = time.perf_counter()
+        self._expression.flush()
+        if pending:
+            self._latency.record("expression write", time.perf_counter() - start)
+        self._scheduler.tick()
+        # Flush before the animations advance: a flash played since the last
+        # tick goes out now and is only switched off on the next tick, even
+        # when this tick comes late and the flash has already ended
+        self._midi_out.flush()
+        self._animations.tick()
+        if self._traffic is not None:
+            self._traffic.flush()
+        self._rate_in.roll()
+        self._rate_out.roll()
+        super(FC200, self).update_display()
+
+    def display(self, text, priority=PRIORITY_NORMAL):
+        # Text longer than the two digits scrolls until something else is shown
+        self._display_text.show(text, priority)
+
+    def _display_digit(self, digit, segments, priority):
+        self._midi_out.write(DISPLAY_BANK, digit, segments, priority)
+
+    def leds_show(self, leds, priority=PRIORITY_BULK):
+        # leds holds a value per pedal; only pedals whose LED differs from
+        # what the FC-200 shows are sent, animated pedals are left to the animation
         for i in range(0, 9 + 1):
-            self.led_status(i, 0)
+            if not self._animations.is_playing(i):
+                self.led_status(i, leds[i], priority)
         return
 
     def leds_recall(self):
-        for i in self._led_status[self._page]:
-            self.led_status(i, self._led_status[self._page][i])
-
-    def led_status(self, pedal, value):
-        bank = 1
-        self._send_sysex([bank, pedal, value])
+        self.leds_show(self._page.leds)
+
+    def _page_led(self, number, pedal, value):
+        # Pages that were not built yet read the state when they are
+        page = self._pages.built(number)
+        if page is None:
+            return
+        page.leds[pedal] = value
+        if page is self._page:
+            self.led_status(pedal, value)
+
+    def leds_invalidate(self):
+        # Forget what the FC-200 shows and send every LED and display digit again
+        self._midi_out.invalidate()
+        for pedal in range(LED_PEDALS):
+            if not self._animations.is_playing(pedal):
+                self.led_status(pedal, self._page.leds[pedal], PRIORITY_BULK)
+        self._animations.redraw()
+        self._display_text.redraw()
+
+    def refresh_state(self):
+        # Live calls this when the MIDI ports change, e.g. after the FC-200 was
+        # power-cycled or reconnected, so what it shows is unknown
+        super(FC200, self).refresh_state()
+        self.leds_invalidate()
+
+    def led_status(self, pedal, value, priority=PRIORITY_NORMAL):
+        self._midi_out.write(LED_BANK, pedal, value, priority)
         return
 
     def flash_led(self, pedal_id):
-        # Turn LED ON
-        self.led_status(pedal_id, 127)
-        
-        # Schedule the OFF command 100ms later
-        self._tasks.add(Task.sequence(
-            Task.wait(0.1), # 0.1 seconds = 100ms
-            Task.run(lambda: self.led_status(pedal_id, 0))
-        ))
-
-    def blink_led(self, led):
-        self.led_status(led, self.blink_led_value)
-        self.blink_led_value = 0 if self.blink_led_value == 127 else 127
-
-    def blink_leds(self):
-        for i in range(0, 9):
-            if i == 4:
-                continue
-            if i == self._parameter_control_selected:
-                self.led_status(self._parameter_control_selected, 127)
-                continue
-            self.led_status(i, self.blink_leds_value)
-        self.blink_leds_value = 0 if self.blink_leds_value == 127 else 127
+        self._animations.play(pedal_id, self._flash)
+
+    def _animation_frame(self, pedal, value):
+        self.led_status(pedal, value, PRIORITY_FEEDBACK)
+
+    def _rest_led(self, pedal):
+        # What a pedal shows once its animation is over
+        return self._page.leds[pedal]
 
     def _listeners(self):
-        def update_led(pedal, loop):
-            self.log_message(f"parameter {loop} changed, updating LED {pedal}")
-            value = self._observed_params[pedal][0]
-            led_value = 127 if str(value) == "On" else 0
-            self._led_status[1][pedal] = led_value 
-            if self._page != 1:
-                return
-            self.led_status(pedal, led_value)
+        def update_led(pedal, loop, parameter):
+            self._log.debug("parameter %d changed, updating LED %d", loop, pedal)
+            led_value = 127 if str(parameter) == "On" else 0
+            self._page_led(1, pedal, led_value)
             return
 
-        # Add listeners for page_1 (device on/off)
+        # Add listeners for page_1 (device on/off), replacing those of a previous board layout
+        self._registry.clear("device on")
         for index, loop in enumerate(LOOP_MAPPING):
-            parameter = self._board.devices[loop].parameters[0]
-
-            callback = lambda i=index, l=loop: update_led(i, l)
-
-            if not parameter.value_has_listener(callback):
-                parameter.add_value_listener(callback)
-                self._observed_params.append((parameter, callback))
-        self.log_message(f"Added listeners for {len(self._observed_params)} devices")
+            device = self._board_resolver.device(loop)
+            if device is None:
+                continue
+            parameter = device.parameters[0]
+            callback = lambda i=index, l=loop, p=parameter: update_led(i, l, p)
+            self._registry.add(parameter, "value", callback, "device on")
+        self._log.debug("Added listeners for %d devices", self._registry.count("device on"))
         return
 
     def _on_is_playing_changed(self):
         is_playing = self.song().is_playing 
         led_value = 127 if is_playing else 0
-        self._led_status[0][0] = led_value
-        if self._page != 0:
-            return
-        self.led_status(0, led_value)
+        self._page_led(0, 0, led_value)
         return
 
     def _on_metronome_changed(self):
         metronome_state = self.song().metronome
         led_value = 127 if metronome_state else 0
-        self._led_status[0][5] = led_value
-        if self._page != 0:
-            return
-        self.led_status(5, led_value)
+        self._page_led(0, 5, led_value)
         return
 
-    def _init_leds(self):
+    def _init_leds(self, page):
         for index, loop in enumerate(LOOP_MAPPING):
-            parameter = self._board.devices[loop].parameters[0]
-            value = parameter.value
+            device = self._board_resolver.device(loop)
+            value = device.parameters[0].value if device is not None else 0
             led_value = 127 if value else 0
-            self._led_status[1][index] = led_value
+            page.leds[index] = led_value
         return
 
-    def handle_sysex(self, midi_bytes):
-        self.midi_bytes = midi_bytes
-        if midi_bytes[0] != 240:        # SysEx start
-            return
-        if midi_bytes[1] != 65:         # Roland Manufacturer ID
-            return
-        if midi_bytes[2] != 0:          # Device ID
-            return
-        if midi_bytes[3] != 114:        # Model ID
-            return
-        if midi_bytes[4] != 18:         # Command ID
-            return
-
-        bank = midi_bytes[5]
-        pedal = midi_bytes[6]
-        value = midi_bytes[7]
-        body = [bank, pedal, value]
-
-        # Debug
-        self.log_message(f"\nReceived SysEx: {midi_bytes}\nbank {bank}, pedal {pedal}, value {value}")
+    def _build_page(self, number):
+        page = Page(number, self._dispatch.page_handlers(number))
+        if number == 0:
+            page.leds[0] = 127 if self.song().is_playing else 0
+            page.leds[5] = 127 if self.song().metronome else 0
+        elif number == 1:
+            self._init_leds(page)
+        self._log.debug("Built page %d", number)
+        return page
 
-        checksum = midi_bytes[-2]
-
-        check_checksum = (128 - ((bank + pedal + value) % 128)) % 128
-
-        if checksum != check_checksum:  # Checksum
-            return
-
-        if midi_bytes[-1] == 247:       # Return list at end of message
-            if self._parameter_control is not None:
-                self.parameter_control(body)
-                return
-            if self._page == 0:
-                self.page_0(body)
-                return
-            if self._page == 1:
-                self.page_1(body)
-                return
-            if self._page == 2:
-                self.page_2(body)
-                return
+    def handle_sysex(self, midi_bytes):
+        start = time.perf_counter()
+        self._rate_in.count += 1
+        if self._traffic is not None:
+            self._traffic.record(IN, midi_bytes)
+        event = parse(midi_bytes)
+        if event == INVALID:
+            # Several messages can arrive concatenated in one buffer
+            if len(midi_bytes) > FRAME_LENGTH:
+                for event in parse_batch(midi_bytes):
+                    self._dispatch_event(event, start)
+            return
+        self._dispatch_event(event, start)
+
+    def _dispatch_event(self, event, start):
+        # A board edit since the last tick is handled before the handler is
+        # looked up, so the mode it may exit is never left under a handler
+        self._board_resolver.refresh()
+        pedal = (event >> 8) & 255
+        if LOG_DUMP_COMBO and pedal in LOG_DUMP_COMBO and self._check_log_dump(pedal, event & 255):
+            return
+        handler = self._page.resolve(self._mode, event)
+        if handler is not None:
+            handler((event >> 8) & 255, event & 255)
+            # From arrival in handle_sysex until the handler's Live writes are done
+            self._latency.record(handler.__name__, time.perf_counter() - start)
 
     def _on_param_changed(self):
         led_status = 0 if self.device.value == 0 else 127
         self.led_status(0, led_status)
 
     def _page_up(self):
-        if self._page == MAX_PAGE:
+        if self._page.number == MAX_PAGE:
             return
-        self._page += 1
-        self.leds_off()
-        self.leds_recall()
-        self.display(1, "")
-        self.display(0, self._page)
-        self.show_message(f"Page {self._page}")
-        self.log_message(f"Page changed to {self._page}")
+        self._show_page(self._page.number + 1)
+
     def _page_down(self):
-        if self._page == MIN_PAGE:
+        if self._page.number == MIN_PAGE:
             return
-        self._page -= 1
-        self.leds_off()
+        self._show_page(self._page.number - 1)
+
+    def _show_page(self, number):
+        # Swapping in the page's LED array only sends the pedals that differ
+        self._page = self._pages.get(number)
         self.leds_recall()
-        self.display(1, "")
-        self.display(0, self._page)
-        self.show_message(f"Page {self._page}")
-        self.log_message(f"Page changed to {self._page}")
-
-    def toggle_device(self, body):
-        pedal_loops = self._board.devices
-        if body[1] >= len(LOOP_MAPPING):
+        self.display(number)
+        self.show_message(f"Page {number}")
+        self._log.debug("Page changed to %d", number)
+
+    def toggle_device(self, pedal, value):
+        pedal_loop = self._board_resolver.device(LOOP_MAPPING[pedal])
+        if pedal_loop is None:
             return
-        pedal_loop = pedal_loops[LOOP_MAPPING[body[1]]]
         pedal_loop.parameters[0].value = 0 if pedal_loop.parameters[0].value == 1 else 1
         return
 
     def volume_control(self, value):
-        parameter = self._board.devices[LOOP_VOLUME].parameters[1]
-        parameter.value = value
+        self._expression_value("volume", value)
 
-    def favorite_parameter(self, body):
-        pedal = body[1]
-        parameter = self._board.devices[LOOP_MAPPING[pedal]].parameters[FAVORITE_PARAMETERS[pedal]]
-        self._favorite_parameter_pedal = pedal
-        self._favorite_parameter = parameter
-        self.leds_off()
-        self.led_status(pedal, 127)
-        return
+    def _bind_volume(self):
+        device = self._board_resolver.device(LOOP_VOLUME)
+        self._bind_expression("volume", device.parameters[1] if device is not None else None, VOLUME_CURVE)
 
-    def parameter_control(self, body):
-        # Map expression pedal to parameter_control selected parameter
-        if body[0] == 0 and body[1] == 13 and self._parameter_control_selected_parameter is not None:
-            self._parameter_control_selected_parameter.value = body[2]
+    def _bind_expression(self, target, parameter, curve=PARAMETER_CURVE):
+        # Builds the lookup table once per binding, None unbinds the target
+        self._expression.discard(target)
+        if parameter is None:
+            self._expression_maps.pop(target, None)
             return
+        self._expression_maps[target] = ExpressionMap(parameter, curve, EXPRESSION_HEEL, EXPRESSION_TOE, EXPRESSION_HYSTERESIS)
 
-        # Map CTL pedal to exit parameter_control mode
-        if body == [0, 12, 0]:
-            return # Ignore releasing
-        if body == [0, 12, 127] and self._parameter_control_blink is not None: 
-            self._parameter_control = None
-            self._parameter_control_selected = None
-            self._parameter_control_selected_pedal = None
-            self._parameter_control_selected_parameter = None
-            self._parameter_control_chains = None
-            self._parameter_control_selected_chain = None
-            self._parameter_control_selected_chain_index = None
-            self._parameter_control_blink.kill()
-            self._parameter_control_blink = None
-            self.leds_off()
-            self.flash_led(12)
+    def _expression_value(self, target, value):
+        expression_map = self._expression_maps.get(target)
+        if expression_map is None:
             return
+        mapped = expression_map.map(value)
+        if mapped is not None:
+            self._expression.submit(target, expression_map.parameter, mapped)
 
-        # Map bank up pedal to select different chains
-        if body == [0, 10, 127] and self._parameter_control_selected_chain_index is not None and self._parameter_control_chains is not None:
-            if self._parameter_control_selected_chain_index <= 0:
-                return
-            self._board.devices[self._parameter_control].view.selected_chain = self._parameter_control_chains[self._parameter_control_selected_chain_index - 1]
-            self._parameter_control_selected_chain_index -= 1
-            self.flash_led(10)
+    def favorite_parameter(self, pedal, value):
+        # Pressing the selected pedal again opens full parameter control
+        if self._mode == MODE_FAVORITE and pedal == self._favorite_parameter_pedal:
+            self.parameter_control(LOOP_MAPPING[pedal])
             return
-        # Map bank down pedal to select different chains
-        if body == [0, 11, 127] and self._parameter_control_selected_chain_index is not None and self._parameter_control_chains is not None:
-            if self._parameter_control_selected_chain_index >= len(self._parameter_control_chains):
-                return
-            self._board.devices[self._parameter_control].view.selected_chain = self._parameter_control_chains[self._parameter_control_selected_chain_index + 1]
-            self._parameter_control_selected_chain_index += 1
-            self.flash_led(11)
+        device = self._board_resolver.device(LOOP_MAPPING[pedal])
+        if device is None:
             return
+        parameter = device.parameters[FAVORITE_PARAMETERS[pedal]]
+        self._set_mode(MODE_FAVORITE)
+        self._favorite_parameter_pedal = pedal
+        self._favorite_parameter = parameter
+        self._bind_expression("favorite", parameter)
+        leds = bytearray(LED_PEDALS)
+        leds[pedal] = 127
+        self.leds_show(leds, PRIORITY_FEEDBACK)
+        return
 
-        # Initialize parameter_control mode with blinking
-        if not self._parameter_control_selected and self._parameter_control_blink is None:
-            self._favorite_parameter = None
-            self._favorite_parameter_pedal = None
-            self._parameter_control_chains = list(self._board.devices[self._parameter_control].chains)
-            self._parameter_control_selected_chain = self._board.devices[self._parameter_control].view.selected_chain
-            self._parameter_control_selected_chain_index = self._parameter_control_chains.index(self._board.devices[self._parameter_control].view.selected_chain)
-            self.log_message(self._parameter_control_selected_chain)
-            self.blink_leds_value = 127
-            self.blink_leds()
-            self._parameter_control_blink = self._tasks.add(Task.loop(Task.sequence(Task.wait(0.5), Task.run(self.blink_leds))))
-            return
+    def _exit_favorite_parameter(self):
+        self._bind_expression("favorite", None)
+        self._favorite_parameter = None
+        self._favorite_parameter_pedal = None
+        self.leds_recall()
 
-        # Map pedals 1-4 and 6-9 to parameters (macros)
-        if body[0] == 0 and 0 <= body[1] < 9 and body[1] != 4 and body[2] == 127:
-            parameter_index = (body[1] - 4) if body[1] >= 5 else body[1] + 5
-            self._parameter_control_selected = body[1]
-            self._parameter_control_selected_parameter = self._board.devices[self._parameter_control].parameters[parameter_index]
+    def parameter_control(self, device_index):
+        device = self._board_resolver.device(device_index)
+        if device is None:
+            return
+        self._set_mode(MODE_PARAMETER)
+        self._parameter_control = device_index
+        self._parameter_control_chains = list(device.chains)
+        self._parameter_control_selected_chain = device.view.selected_chain
+        self._parameter_control_selected_chain_index = self._parameter_control_chains.index(self._parameter_control_selected_chain)
+        self._log.debug("Parameter control on chain %s", self._parameter_control_selected_chain.name)
+        for pedal in PARAMETER_PEDALS:
+            self._animations.play(pedal, self._blink)
+
+    def _exit_parameter_control(self):
+        self._bind_expression("parameter", None)
+        self._parameter_control = None
+        self._parameter_control_selected = None
+        self._parameter_control_selected_pedal = None
+        self._parameter_control_selected_parameter = None
+        self._parameter_control_chains = None
+        self._parameter_control_selected_chain = None
+        self._parameter_control_selected_chain_index = None
+        for pedal in PARAMETER_PEDALS:
+            self._animations.stop(pedal, restore=False)
+        self.leds_recall()
 
-            self.show_message(f"{self._board.devices[self._parameter_control].name} - {self._parameter_control_selected_parameter.name}")
-            self.led_status(body[1], 127)
+    def _set_mode(self, mode):
+        """ Switches the input mode, running the exit step of the mode being left """
+        if mode == self._mode:
+            return
+        exit_mode = self._mode_exits.get(self._mode)
+        self._log.debug("Mode changed to %s", MODE_NAMES[mode])
+        self._mode = mode
+        if exit_mode is not None:
+            exit_mode()
 
     def tap_tempo(self):
         self.song().tap_tempo()
@@ -465,20 +612,16 @@ class FC200(ControlSurface):
         self.song().stop_all_clips()
 
     def start_scene(self):
-        selected_scene = self.song().view.selected_scene
-        selected_scene.fire()
+        name = self._scenes.selected_name()
+        self.song().view.selected_scene.fire()
         self.move_scene(1)
-        self.show_message(f"Fired: {selected_scene.name}")
+        self.show_message(f"Fired: {name}")
     
     def move_scene(self, direction):
-        all_scenes = list(self.song().scenes)
-        selected_scene = self.song().view.selected_scene
-        selected_scene_index = all_scenes.index(selected_scene)
-        new_index = selected_scene_index + direction 
-        if 0 <= new_index < len(all_scenes):
-            self.song().view.selected_scene = all_scenes[new_index]
-            new_name = all_scenes[new_index].name
-            self.show_message(f"Scene: {new_name}")
+        new_index = self._scenes.neighbour(direction)
+        if new_index is not None:
+            self.song().view.selected_scene = self._scenes.scene(new_index)
+            self.show_message(f"Scene: {self._scenes.name(new_index)}")
         return
 
     def toggle_click(self):
@@ -486,173 +629,144 @@ class FC200(ControlSurface):
         return
 
 
-    def page_0(self, body):
-        # Page UP
-        if body == [0, 10, 127]:
-            self._page_up()
-            self.flash_led(10)
-            if self._preset_store_blinking_led is not None:
-                self._preset_store_blinking_led.kill()
-                self._preset_store_blinking_led = None
-            return
-        # Page DOWN 
-        if body == [0, 11, 127]:
-            self._page_down()
-            self.flash_led(11)
-            if self._preset_store_blinking_led is not None:
-                self._preset_store_blinking_led.kill()
-                self._preset_store_blinking_led = None
-            return
-        # Expression pedal calls volume_control
-        if body[1] == 13:
-            self.volume_control(body[2])
-            return
-        # CTL button calls tap_tempo
-        if body == [0, 12, 127]:
-            if self._preset_store_blinking_led is not None:
-                self._preset_store_blinking_led.kill()
-                self._preset_store_blinking_led = None
-                self.show_message("Cancelled saving preset!")
-                self.led_status(7, 0)
-                return
-            self.tap_tempo()
-            self.flash_led(12)
-            return
-        # Ableton "start" button
-        if body == [0, 0, 127]:
-            self.start_button()
-            return
-        # Ableton "stop" button and stop all clips
-        if body == [0, 1, 127]:
-            self.stop_button()
-            self.stop_all()
-            self.flash_led(1)
-            return
-        # Ableton start scene
-        if body == [0, 2, 127]:
-            self.start_scene()
-            self.flash_led(2)
-            return
-        # Ableton scene down
-        if body == [0, 3, 127]:
-            self.move_scene(1)
-            self.flash_led(3)
-            return
-        # Ableton scene up
-        if body == [0, 4, 127]:
-            self.move_scene(-1)
-            self.flash_led(4)
-            return
-        # Ableton click on/off 
-        if body == [0, 5, 127]:
-            self.toggle_click()
-            return
-        # Start scene and stop immediately (recall preset)
-        if body == [0, 6, 127]:
-            # self.flash_led(6)
-            return
-        # Store preset
-        if body == [0, 7, 127]:
-            self._store_preset()
-            self.flash_led(7)
-            return
-        # ForScore prev page
-        if body == [0, 8, 127]:
-            # self.flash_led(8)
-            return
-        # ForScore next page
-        if body == [0, 9, 127]:
-            # self.flash_led(9)
-            return
+    def _build_dispatch(self):
+        table = DispatchTable()
+        # Modes only override the pedals they use, everything else acts as normal
+        table.inherit(MODE_FAVORITE, MODE_NORMAL)
+        table.inherit(MODE_PRESET_CONFIRM, MODE_NORMAL)
+
+        # All pages: bank up/down switch pages, expression pedal calls volume_control
+        table.add(MODE_NORMAL, ANY, 0, 10, PRESS, self._on_page_up)
+        table.add(MODE_NORMAL, ANY, 0, 11, PRESS, self._on_page_down)
+        table.add(MODE_NORMAL, ANY, 0, 13, ANY, self._on_volume_control)
+
+        # Page 0: transport, scenes and presets
+        table.add(MODE_NORMAL, 0, 0, 12, PRESS, self._on_tap_tempo)
+        table.add(MODE_NORMAL, 0, 0, 0, PRESS, self._on_start)
+        table.add(MODE_NORMAL, 0, 0, 1, PRESS, self._on_stop)
+        table.add(MODE_NORMAL, 0, 0, 2, PRESS, self._on_start_scene)
+        table.add(MODE_NORMAL, 0, 0, 3, PRESS, self._on_scene_down)
+        table.add(MODE_NORMAL, 0, 0, 4, PRESS, self._on_scene_up)
+        table.add(MODE_NORMAL, 0, 0, 5, PRESS, self._on_toggle_click)
+        table.add(MODE_NORMAL, 0, 0, 7, PRESS, self._on_store_preset)
+        table.add(MODE_PRESET_CONFIRM, 0, 0, 7, PRESS, self._on_confirm_store_preset)
+        table.add(MODE_PRESET_CONFIRM, 0, 0, 12, PRESS, self._on_cancel_store_preset)
+
+        # Page 1: toggle device on/off for every loop
+        table.add(MODE_NORMAL, 1, 0, 12, PRESS, self._on_tap_tempo)
+        table.add_presses(MODE_NORMAL, 1, range(len(LOOP_MAPPING)), self.toggle_device)
+
+        # Page 2: favorite parameter per loop, pressing it again opens parameter control
+        table.add_presses(MODE_NORMAL, 2, range(len(LOOP_MAPPING)), self.favorite_parameter)
+        table.add(MODE_FAVORITE, 2, 0, 13, ANY, self._on_favorite_parameter_value)
+        table.add(MODE_FAVORITE, 2, 0, 12, PRESS, self._on_exit_mode)
+
+        # Parameter control: pedals 1-4 and 6-9 select macros, bank up/down select chains
+        table.add(MODE_PARAMETER, ANY, 0, 13, ANY, self._on_parameter_control_value)
+        table.add(MODE_PARAMETER, ANY, 0, 12, PRESS, self._on_exit_mode)
+        table.add(MODE_PARAMETER, ANY, 0, 10, PRESS, self._on_parameter_control_chain)
+        table.add(MODE_PARAMETER, ANY, 0, 11, PRESS, self._on_parameter_control_chain)
+        table.add_presses(MODE_PARAMETER, ANY, PARAMETER_PEDALS, self._on_parameter_control_select)
+        return table
+
+    def _on_page_up(self, pedal, value):
+        self._set_mode(MODE_NORMAL)
+        self._page_up()
+        self.flash_led(10)
+
+    def _on_page_down(self, pedal, value):
+        self._set_mode(MODE_NORMAL)
+        self._page_down()
+        self.flash_led(11)
+
+    def _on_volume_control(self, pedal, value):
+        self.volume_control(value)
+
+    def _on_tap_tempo(self, pedal, value):
+        self.tap_tempo()
+        self.flash_led(12)
+
+    def _on_start(self, pedal, value):
+        self.start_button()
+
+    def _on_stop(self, pedal, value):
+        self.stop_button()
+        self.stop_all()
+        self.flash_led(1)
+
+    def _on_start_scene(self, pedal, value):
+        self.start_scene()
+        self.flash_led(2)
+
+    def _on_scene_down(self, pedal, value):
+        self.move_scene(1)
+        self.flash_led(3)
 
-    def page_1(self, body):
-        # Page UP
-        if body == [0, 10, 127]:
-            self._page_up()
-            self.flash_led(10)
-            return
-        # Page DOWN 
-        if body == [0, 11, 127]:
-            self._page_down()
-            self.flash_led(11)
-            return
-        # Expression pedal calls volume_control
-        if body[1] == 13:
-            self.volume_control(body[2])
-            return
-        # CTL button calls tap_tempo
-        if body == [0, 12, 127]:
-            self.tap_tempo()
-            self.flash_led(12)
-            return
-        # Toggle Device On/Off for pedals 1 thru 10
-        if body[0] == 0 and 0 <= body[1] < 10 and body[2] == 127:
-            self.toggle_device(body)
-            return
+    def _on_scene_up(self, pedal, value):
+        self.move_scene(-1)
+        self.flash_led(4)
 
-    def page_2(self, body):
-        # Page UP
-        if body == [0, 10, 127]:
-            self._favorite_parameter = None
-            self._favorite_parameter_pedal = None
-            self._page_up()
-            self.flash_led(10)
-            return
-        # Page DOWN 
-        if body == [0, 11, 127]:
-            self._favorite_parameter = None
-            self._favorite_parameter_pedal = None
-            self._page_down()
-            self.flash_led(11)
-            return        
-        # Expression pedal calls volume_control
-        if body[1] == 13 and self._favorite_parameter is None and self._parameter_control is None:
-            self.volume_control(body[2])
-            return
-        # Device full parameter mode
-        if self._favorite_parameter and body[0] == 0 and body[1] == self._favorite_parameter_pedal and body[2] == 127:
-            self._parameter_control = LOOP_MAPPING[body[1]]
-            self.parameter_control(body)
-            return
-        # Exit favorite parameter control
-        if body == [0, 12, 127] and self._favorite_parameter is not None:
-            self._favorite_parameter = None
-            self._favorite_parameter_pedal = None
-            self.leds_off()
-            self.flash_led(12)
-            return
-        # Control favorite parameter when selected with pedal
-        if self._favorite_parameter and body[0] == 0 and body[1] == 13:
-            self._favorite_parameter.value = body[2]
-            return
-        # Device favorite parameter mode
-        if body[0] == 0 and 0 <= body[1] < 10 and body[2] == 127:
-            self.favorite_parameter(body)
-            return
+    def _on_toggle_click(self, pedal, value):
+        self.toggle_click()
 
+    def _on_store_preset(self, pedal, value):
+        # Flash first, asking for confirmation replaces the flash with a blink
+        self.flash_led(7)
+        self._store_preset()
 
+    def _on_confirm_store_preset(self, pedal, value):
+        self._store_preset(confirmed=True)
+        self.flash_led(7)
 
-    def disconnect(self):
-        """Clean up when the script is unloaded."""
-        self.log_message("(FC200) Removing all listeners...")
+    def _on_cancel_store_preset(self, pedal, value):
+        self._set_mode(MODE_NORMAL)
+        self.show_message("Cancelled saving preset!")
+        self.led_status(7, 0)
 
-        # Remove listeners for page_0 (is_playing, metronome)
-        if self.song().is_playing_has_listener(self._on_is_playing_changed):
-            self.song().remove_is_playing_listener(self._on_is_playing_changed)
-        if self.song().metronome_has_listener(self._on_metronome_changed):
-            self.song().remove_metronome_listener(self._on_metronome_changed)
+    def _on_exit_mode(self, pedal, value):
+        self._set_mode(MODE_NORMAL)
+        self.flash_led(12)
 
-        if not self._track.playing_slot_index_has_listener(self._load_preset):
-            self._track.remove_playing_slot_index_listener(self._load_preset)
+    def _on_favorite_parameter_value(self, pedal, value):
+        self._expression_value("favorite", value)
 
-        # Remove listeners for page_1 (device_on)
-        for param, callback in self._observed_params:
-            if param.value_has_listener(callback):
-                param.remove_value_listener(callback)
+    def _on_parameter_control_value(self, pedal, value):
+        self._expression_value("parameter", value)
+
+    def _on_parameter_control_chain(self, pedal, value):
+        # Bank up selects the previous chain, bank down the next one
+        index = self._parameter_control_selected_chain_index + (-1 if pedal == 10 else 1)
+        if not 0 <= index < len(self._parameter_control_chains):
+            return
+        self._board_resolver.device(self._parameter_control).view.selected_chain = self._parameter_control_chains[index]
+        self._parameter_control_selected_chain_index = index
+        self.flash_led(pedal)
 
-        self._observed_params = []
+    def _on_parameter_control_select(self, pedal, value):
+        parameter_index = (pedal - 4) if pedal >= 5 else pedal + 5
+        device = self._board_resolver.device(self._parameter_control)
+        if self._parameter_control_selected is not None:
+            self._animations.play(self._parameter_control_selected, self._blink)
+        self._parameter_control_selected = pedal
+        self._parameter_control_selected_parameter = device.parameters[parameter_index]
+        self._bind_expression("parameter", self._parameter_control_selected_parameter)
 
-        self.log_message("--- MyCustomSysEx Script Unloaded ---")
+        self.show_message(f"{device.name} - {self._parameter_control_selected_parameter.name}")
+        self._animations.play(pedal, self._hold)
+
+    def disconnect(self):
+        """Clean up when the script is unloaded."""
+        self._log.info("(FC200) Removing all listeners...")
+        self._registry.disconnect()
+        self._preset_writer.stop()
+        self._presets.stop()
+        self._display_text.stop()
+        self._scheduler.clear()
+        if self._traffic is not None:
+            self._traffic.close()
+            self._traffic = None
+
+        self._log.info("--- MyCustomSysEx Script Unloaded ---")
         super(FC200, self).disconnect()
 
 
@@ -766,7 +880,7 @@ class FC200(ControlSurface):
 #     def _setup_mixer_control(self):
 #
 #         is_momentary = True
-#         self._mixer = SpecialMixerComponent(8)
+#         self._mixer = SpecialMixerComponent(8, self._scheduler)
 #         self._mixer.name = 'Mixer'
 #         self._mixer.master_strip().name = 'Master_Channel_Strip'
 #         self._mixer.master_strip().set_select_button(self._note_map[MASTERSEL])
@@ -810,7 +924,7 @@ class FC200(ControlSurface):
 #         self._device.set_lock_button(self._note_map[DEVICELOCK])
 #         self.set_device_component(self._device)
 #
-#         detail_view_toggler = DetailViewControllerComponent()
+#         detail_view_toggler = DetailViewControllerComponent(self._scheduler)
 #         detail_view_toggler.name = 'Detail_View_Control'
 #         detail_view_toggler.set_device_clip_toggle_button(self._note_map[CLIPTRACKVIEW])
 #         detail_view_toggler.set_detail_toggle_button(self._note_map[DETAILVIEW])
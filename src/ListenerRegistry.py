@@ -0,0 +1,67 @@
+class ListenerRegistry:
+    """
+    Owns every Live listener the script adds.
+
+    A subscription is a (subject, property, callback) triple, added through
+    add() instead of subject.add_<property>_listener. Adding the same triple
+    twice is a no-op, found with one dict lookup. Subscriptions can be tagged
+    with a group so a part of the script can drop its own in one call, and
+    disconnect() removes everything that is left when the script unloads.
+    """
+
+    def __init__(self, log=None):
+        self._log = log
+        self._subscriptions = {}
+        self._groups = {}
+
+    def add(self, subject, name, callback, group=None):
+        """ Subscribes callback to subject's name property, returns False if it already was """
+        # Subjects are kept alive by the entry, so their id cannot be reused while registered
+        key = (id(subject), name, callback)
+        if key in self._subscriptions:
+            return False
+        if not getattr(subject, name + "_has_listener")(callback):
+            getattr(subject, "add_" + name + "_listener")(callback)
+        self._subscriptions[key] = (subject, group)
+        self._groups.setdefault(group, set()).add(key)
+        return True
+
+    def remove(self, subject, name, callback):
+        key = (id(subject), name, callback)
+        entry = self._subscriptions.pop(key, None)
+        if entry is None:
+            return False
+        self._groups[entry[1]].discard(key)
+        self._unsubscribe(entry[0], name, callback)
+        return True
+
+    def clear(self, group):
+        """ Removes every subscription of a group, returns how many there were """
+        keys = self._groups.pop(group, ())
+        for key in keys:
+            subject, _ = self._subscriptions.pop(key)
+            self._unsubscribe(subject, key[1], key[2])
+        return len(keys)
+
+    def disconnect(self):
+        """ Removes every subscription, returns how many there were """
+        count = len(self._subscriptions)
+        for group in list(self._groups):
+            self.clear(group)
+        if self._log is not None:
+            self._log.info("Removed %d listeners", count)
+        return count
+
+    def count(self, group):
+        return len(self._groups.get(group, ()))
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def _unsubscribe(self, subject, name, callback):
+        try:
+            if getattr(subject, name + "_has_listener")(callback):
+                getattr(subject, "remove_" + name + "_listener")(callback)
+        except RuntimeError:
+            # The subject was deleted from the set, Live dropped its listeners already
+            pass
@@ -0,0 +1,80 @@
+import time
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {
+    DEBUG: "DEBUG",
+    INFO: "INFO",
+    WARNING: "WARNING",
+    ERROR: "ERROR",
+}
+
+
+def format_record(record):
+    timestamp, level, message, args = record
+    if args:
+        message = message % args
+    return "[%.3f] %s %s" % (timestamp, LEVEL_NAMES.get(level, level), message)
+
+
+class RingLog:
+    """
+    Leveled logger in front of Live's Log.txt. Messages take %-style args that
+    are only formatted when a record is actually written out. Records at or
+    above capture_level are also kept in a fixed-size ring buffer that can be
+    dumped on demand.
+    """
+
+    def __init__(self, write, level=INFO, capture_level=DEBUG, size=256, clock=time.monotonic):
+        self._write = write
+        self._clock = clock
+        self._records = deque(maxlen=size)
+        self.set_levels(level, capture_level)
+
+    def set_levels(self, level, capture_level):
+        self.level = level
+        self.capture_level = capture_level
+        self._min_level = min(level, capture_level)
+
+    def is_enabled_for(self, level):
+        return level >= self._min_level
+
+    def log(self, level, message, *args):
+        if level < self._min_level:
+            return
+        record = (self._clock(), level, message, args)
+        if level >= self.capture_level:
+            self._records.append(record)
+        if level >= self.level:
+            self._write(format_record(record))
+
+    def debug(self, message, *args):
+        if DEBUG >= self._min_level:
+            self.log(DEBUG, message, *args)
+
+    def info(self, message, *args):
+        self.log(INFO, message, *args)
+
+    def warning(self, message, *args):
+        self.log(WARNING, message, *args)
+
+    def error(self, message, *args):
+        self.log(ERROR, message, *args)
+
+    def records(self):
+        return [format_record(record) for record in self._records]
+
+    def dump(self):
+        """ Writes the ring buffer to the log, oldest first, and returns the record count """
+        records = self.records()
+        self._write("--- FC200 log dump: %d records ---" % len(records))
+        for line in records:
+            self._write(line)
+        return len(records)
+
+    def clear(self):
+        self._records.clear()
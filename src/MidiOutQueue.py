@@ -0,0 +1,74 @@
+import time
+from .SysExFrames import SysExFrames
+
+PRIORITY_FEEDBACK = 0   # press feedback, goes out first
+PRIORITY_NORMAL = 1     # listener updates, display
+PRIORITY_BULK = 2       # recalls after page or mode changes
+PRIORITIES = 3
+
+FRAME_BYTES = 10
+# MIDI DIN runs at 31250 baud with 10 bits per byte
+FC200_BYTES_PER_SECOND = 3125
+TICK_SECONDS = 0.1
+
+
+class MidiOutQueue:
+    """
+    Buffers outgoing LED/display writes until flush() is called once per tick.
+    Writes to the same (bank, pedal) address collapse into the last value,
+    and a write is dropped when the hardware already shows that value.
+    """
+
+    def __init__(self, send_midi, bytes_per_second=FC200_BYTES_PER_SECOND, burst_bytes=None, clock=time.monotonic):
+        self._send_midi = send_midi
+        self._clock = clock
+        self._bytes_per_second = bytes_per_second
+        if burst_bytes is None:
+            burst_bytes = max(FRAME_BYTES, int(bytes_per_second * TICK_SECONDS))
+        self._burst_bytes = burst_bytes
+        self._tokens = burst_bytes
+        self._last_flush = clock()
+        self._shown = {}
+        self._pending = [{} for _ in range(PRIORITIES)]
+        self._queued_priority = {}
+
+    def write(self, bank, pedal, value, priority=PRIORITY_NORMAL):
+        address = (bank << 8) | pedal
+        queued = self._queued_priority.get(address)
+        if queued is not None:
+            del self._pending[queued][address]
+            del self._queued_priority[address]
+            if queued < priority:
+                priority = queued
+        if self._shown.get(address) == value:
+            return
+        self._pending[priority][address] = value
+        self._queued_priority[address] = priority
+
+    def flush(self):
+        """ Sends pending frames in priority order within the byte budget """
+        now = self._clock()
+        self._tokens = min(self._burst_bytes, self._tokens + (now - self._last_flush) * self._bytes_per_second)
+        self._last_flush = now
+        if not self._queued_priority:
+            return 0
+        sent = 0
+        for pending in self._pending:
+            while pending:
+                if self._tokens < FRAME_BYTES:
+                    return sent
+                address = next(iter(pending))
+                value = pending.pop(address)
+                del self._queued_priority[address]
+                self._shown[address] = value
+                self._send_midi(SysExFrames.frame(address >> 8, address & 255, value))
+                self._tokens -= FRAME_BYTES
+                sent += 1
+        return sent
+
+    def invalidate(self):
+        """ Forgets the hardware state, the next write to every address goes out """
+        self._shown.clear()
+
+    def pending_count(self):
+        return len(self._queued_priority)
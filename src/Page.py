@@ -0,0 +1,47 @@
+from .Dispatch import ANY, dispatch_key
+from .SysExFrames import LED_PEDALS
+
+
+class Page:
+    """
+    One page of the board: the LED value of every pedal address, one byte
+    each, and the handlers its pedals dispatch to in every mode.
+    """
+
+    __slots__ = ("number", "leds", "_handlers")
+
+    def __init__(self, number, handlers):
+        self.number = number
+        self.leds = bytearray(LED_PEDALS)
+        self._handlers = handlers
+
+    def resolve(self, mode, event):
+        key = dispatch_key(mode, event)
+        handler = self._handlers.get(key)
+        if handler is None:
+            handler = self._handlers.get(key | ANY)
+        return handler
+
+
+class Pages:
+    """
+    Pages by number, each built by build(number) the first time it is
+    visited. Pages that were never visited cost nothing.
+    """
+
+    def __init__(self, build):
+        self._build = build
+        self._pages = {}
+
+    def get(self, number):
+        page = self._pages.get(number)
+        if page is None:
+            page = self._pages[number] = self._build(number)
+        return page
+
+    def built(self, number):
+        """ The page if it was built already, None otherwise """
+        return self._pages.get(number)
+
+    def __len__(self):
+        return len(self._pages)
@@ -0,0 +1,215 @@
+"""
+Packed preset bank: every preset of the preset folder in one binary file.
+
+Layout, little endian:
+    header    magic "FC2B", u16 version, u32 preset count
+    index     per preset: u16 name length, u32 record offset, u32 record
+              length, utf-8 clip name
+    records   per preset: u16 device count, then per device: u16 device
+              index, u16 parameter count, u16 chain name length (0xFFFF when
+              the device has no "chain" key, 0xFFFE when it is null), utf-8
+              chain name, parameter count float64 values
+
+The index is read when the bank is opened, records are only unpacked from the
+memory map when a preset is looked up.
+
+Run this file to convert between a JSON preset folder and a bank:
+    python PresetBank.py import <preset folder> <bank file>
+    python PresetBank.py export <bank file> <preset folder>
+"""
+import os
+import sys
+import json
+import mmap
+import struct
+import argparse
+
+MAGIC = b"FC2B"
+VERSION = 1
+BANK_EXTENSION = ".fc2bank"
+PRESET_EXTENSION = ".json"
+NO_CHAIN = 0xFFFF
+NULL_CHAIN = 0xFFFE
+
+_HEADER = struct.Struct("<4sHI")
+_INDEX_ENTRY = struct.Struct("<HII")
+_RECORD = struct.Struct("<H")
+_DEVICE = struct.Struct("<HHH")
+
+
+class PresetBankError(Exception):
+    pass
+
+
+def _pack_preset(preset):
+    parts = [_RECORD.pack(len(preset))]
+    for device, d in preset.items():
+        values = d["parameters"]
+        chain = d.get("chain")
+        chain_bytes = b"" if chain is None else chain.encode("utf-8")
+        if "chain" not in d:
+            chain_length = NO_CHAIN
+        elif chain is None:
+            chain_length = NULL_CHAIN
+        else:
+            chain_length = len(chain_bytes)
+        parts.append(_DEVICE.pack(int(device), len(values), chain_length))
+        parts.append(chain_bytes)
+        parts.append(struct.pack("<%dd" % len(values), *values))
+    return b"".join(parts)
+
+
+def _unpack_preset(buffer, offset):
+    preset = {}
+    (devices,) = _RECORD.unpack_from(buffer, offset)
+    offset += _RECORD.size
+    for _ in range(devices):
+        device, count, chain_length = _DEVICE.unpack_from(buffer, offset)
+        offset += _DEVICE.size
+        chain = None
+        if chain_length < NULL_CHAIN:
+            chain = bytes(buffer[offset:offset + chain_length]).decode("utf-8")
+            offset += chain_length
+        d = {"parameters": list(struct.unpack_from("<%dd" % count, buffer, offset))}
+        offset += 8 * count
+        if chain_length != NO_CHAIN:
+            d["chain"] = chain
+        preset[str(device)] = d
+    return preset
+
+
+def write_bank(path, presets):
+    """ Writes a bank from a {clip name: preset} mapping, replacing path atomically """
+    names = [name.encode("utf-8") for name in presets]
+    records = [_pack_preset(preset) for preset in presets.values()]
+    offset = _HEADER.size + sum(_INDEX_ENTRY.size + len(name) for name in names)
+    parts = [_HEADER.pack(MAGIC, VERSION, len(names))]
+    for name, record in zip(names, records):
+        parts.append(_INDEX_ENTRY.pack(len(name), offset, len(record)))
+        parts.append(name)
+        offset += len(record)
+    parts.extend(records)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(b"".join(parts))
+    os.replace(temp_path, path)
+
+
+class PresetBank:
+    """ Read-only view of a bank file, presets are returned in the JSON layout """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError) as e:
+            self._file.close()
+            raise PresetBankError("Cannot map preset bank %s: %s" % (path, e))
+        try:
+            self._index = self._read_index()
+        except (struct.error, UnicodeDecodeError, PresetBankError) as e:
+            self.close()
+            raise PresetBankError("Invalid preset bank %s: %s" % (path, e))
+
+    def _read_index(self):
+        magic, version, count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise PresetBankError("unknown format")
+        index = {}
+        offset = _HEADER.size
+        for _ in range(count):
+            name_length, record_offset, record_length = _INDEX_ENTRY.unpack_from(self._map, offset)
+            offset += _INDEX_ENTRY.size
+            name = self._map[offset:offset + name_length].decode("utf-8")
+            offset += name_length
+            index[name] = record_offset
+        return index
+
+    def names(self):
+        return list(self._index)
+
+    def get(self, name):
+        """ Unpacks one preset, or returns None if the bank does not have it """
+        offset = self._index.get(name)
+        if offset is None:
+            return None
+        return _unpack_preset(self._map, offset)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_folder(folder):
+    """ Loads every JSON preset in folder, sorted by clip name """
+    presets = {}
+    for file_name in sorted(os.listdir(folder)):
+        if file_name.endswith(PRESET_EXTENSION):
+            with open(os.path.join(folder, file_name), "r") as f:
+                presets[file_name[:-len(PRESET_EXTENSION)]] = json.loads(f.read())
+    return presets
+
+
+def import_folder(folder, path):
+    """ Packs a JSON preset folder into a bank and checks it reads back identically """
+    presets = read_folder(folder)
+    write_bank(path, presets)
+    with PresetBank(path) as bank:
+        for name, preset in presets.items():
+            if bank.get(name) != preset:
+                raise PresetBankError("Preset %s does not survive packing" % name)
+    return len(presets)
+
+
+def export_folder(path, folder):
+    """ Writes every preset of a bank as a JSON file, in the layout the script saves """
+    with PresetBank(path) as bank:
+        for name in bank.names():
+            with open(os.path.join(folder, name + PRESET_EXTENSION), "w") as f:
+                f.write(json.dumps(bank.get(name), indent=2))
+        return len(bank)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Convert FC200 presets between a JSON folder and a packed bank")
+    commands = parser.add_subparsers(dest="command")
+    command = commands.add_parser("import", help="pack a JSON preset folder into a bank")
+    command.add_argument("folder")
+    command.add_argument("bank")
+    command = commands.add_parser("export", help="unpack a bank into JSON preset files")
+    command.add_argument("bank")
+    command.add_argument("folder")
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "import":
+            print("Packed %d presets into %s" % (import_folder(args.folder, args.bank), args.bank))
+        elif args.command == "export":
+            if not os.path.isdir(args.folder):
+                os.makedirs(args.folder)
+            print("Exported %d presets to %s" % (export_folder(args.bank, args.folder), args.folder))
+        else:
+            parser.print_help()
+            return 2
+    except (OSError, ValueError, PresetBankError) as e:
+        print("Error: %s" % e, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
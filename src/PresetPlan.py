@@ -0,0 +1,109 @@
+# Stored values differing less than this from the current value are not written
+VALUE_TOLERANCE = 1e-4
+
+
+class PresetPlan:
+    """ A preset resolved against the board: parameter writes and chain selections """
+
+    def __init__(self, writes, chains):
+        self.writes = writes
+        self.chains = chains
+
+    def apply(self, tolerance=VALUE_TOLERANCE):
+        """
+        Writes only the parameters and chains that differ from what Live
+        currently has, returns (writes made, writes skipped)
+        """
+        written = 0
+        skipped = 0
+        for parameter, value in self.writes:
+            if not parameter.is_enabled:
+                continue
+            if abs(parameter.value - value) <= tolerance:
+                skipped += 1
+                continue
+            parameter.value = value
+            written += 1
+        for view, chain in self.chains:
+            if view.selected_chain == chain:
+                skipped += 1
+                continue
+            view.selected_chain = chain
+            written += 1
+        return written, skipped
+
+
+class PresetCompiler:
+    """
+    Compiles presets (rows of device index, parameter values, chain name)
+    into PresetPlans, with devices looked up through a BoardResolver.
+    Parameter handles and a chain name index per device are cached, and
+    listeners on every device's chains and every chain's name drop the
+    caches when they change; the script calls invalidate() when the resolver
+    reports a new board layout. generation changes on every invalidation so
+    callers can tell when a plan they hold is stale; the caches themselves
+    are dropped on the next compile, outside the listener.
+    """
+
+    def __init__(self, resolver, registry, log=None):
+        self._resolver = resolver
+        self._registry = registry
+        self._log = log
+        self._parameters = {}
+        self._chain_index = {}
+        self._stale = False
+        self.generation = 0
+
+    def compile(self, rows):
+        if self._stale:
+            self._reset()
+        writes = []
+        chains = []
+        for device_index, values, chain_name in rows:
+            device = self._resolver.device(device_index)
+            if device is None:
+                continue
+            parameters = self._device_parameters(device_index, device)
+            for p, v in enumerate(values):
+                if p < len(parameters):
+                    writes.append((parameters[p], v))
+            if chain_name is not None:
+                chain = self._device_chains(device_index, device).get(chain_name)
+                if chain is not None:
+                    chains.append((device.view, chain))
+        return PresetPlan(tuple(writes), tuple(chains))
+
+    def invalidate(self):
+        self._stale = True
+        self.generation += 1
+        if self._log is not None:
+            self._log.debug("Preset plans invalidated (generation %d)", self.generation)
+
+    def disconnect(self):
+        self._registry.clear("preset plans")
+
+    def _device_parameters(self, device_index, device):
+        parameters = self._parameters.get(device_index)
+        if parameters is None:
+            parameters = self._parameters[device_index] = tuple(device.parameters)
+        return parameters
+
+    def _device_chains(self, device_index, device):
+        index = self._chain_index.get(device_index)
+        if index is None:
+            index = {}
+            if device.can_have_chains:
+                for chain in device.chains:
+                    # First chain wins on duplicate names, like the old linear scan
+                    index.setdefault(chain.name, chain)
+                    self._registry.add(chain, "name", self.invalidate, "preset plans")
+                self._registry.add(device, "chains", self.invalidate, "preset plans")
+            self._chain_index[device_index] = index
+        return index
+
+    def _reset(self):
+        # Device and chain listeners are re-added on demand
+        self.disconnect()
+        self._parameters = {}
+        self._chain_index = {}
+        self._stale = False
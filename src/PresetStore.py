@@ -0,0 +1,206 @@
+import os
+import json
+import threading
+from collections import OrderedDict, deque
+
+from .PresetBank import PresetBank, PresetBankError
+
+PRESET_EXTENSION = ".json"
+
+
+class PresetStore:
+    """
+    In-memory index of the preset folder keyed by clip name.
+
+    A background thread scans the folder, loads every preset file and reloads
+    files whose mtime changed. At most max_entries parsed presets are kept,
+    the least recently used one is evicted first. get() never touches the
+    file system; a preset that is known but not in memory is loaded in the
+    background with request(), and its callback runs on the main thread from
+    poll(), which the script calls once per tick.
+
+    If bank_name names a packed preset bank in the folder, its presets are
+    indexed too and read from its memory map. A JSON file with the same clip
+    name takes precedence, so presets saved from the pedal board win.
+    """
+
+    def __init__(self, folder, max_entries=256, rescan_interval=5.0, log=None, bank_name=None):
+        self._folder = folder
+        self._bank_path = os.path.join(folder, bank_name) if bank_name else None
+        self._bank = None
+        self._bank_mtime = None
+        self._from_bank = set()
+        self._max_entries = max_entries
+        self._rescan_interval = rescan_interval
+        self._log = log
+        self._lock = threading.Lock()
+        self._known = {}
+        self._presets = OrderedDict()
+        self._requests = deque()
+        self._completed = deque()
+        self._wake = threading.Event()
+        self._scanned = threading.Event()
+        self._stopped = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="FC200 presets")
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+        if self._bank is not None:
+            self._bank.close()
+            self._bank = None
+
+    def get(self, name):
+        """ Returns the cached preset for a clip name, or None """
+        with self._lock:
+            entry = self._presets.get(name)
+            if entry is None:
+                return None
+            self._presets.move_to_end(name)
+            return entry[1]
+
+    def contains(self, name):
+        """ True if the last scan found a preset file for this clip name """
+        return name in self._known
+
+    def request(self, name, callback):
+        """
+        Calls callback(preset) on the main thread once the preset is in
+        memory. Returns True if it was already cached and callback ran now.
+        """
+        preset = self.get(name)
+        if preset is not None:
+            callback(preset)
+            return True
+        if self._scanned.is_set() and name not in self._known:
+            return False
+        self._requests.append((name, callback))
+        self._wake.set()
+        return False
+
+    def put(self, name, preset, mtime=None):
+        """ Stores a preset that was just written by the script """
+        with self._lock:
+            self._known[name] = mtime
+            self._insert(name, mtime, preset)
+
+    def poll(self):
+        """ Runs completed request callbacks, main thread only """
+        while self._completed:
+            callback, preset = self._completed.popleft()
+            callback(preset)
+
+    def __len__(self):
+        return len(self._presets)
+
+    def _path(self, name):
+        return os.path.join(self._folder, name + PRESET_EXTENSION)
+
+    def _run(self):
+        # Requests wake the thread and are served right away, the folder is
+        # only scanned again once rescan_interval passes without one
+        rescan = True
+        while not self._stopped:
+            if rescan:
+                self._scan()
+                self._scanned.set()
+            while self._requests and not self._stopped:
+                name, callback = self._requests.popleft()
+                preset = self.get(name)
+                if preset is None and name in self._known:
+                    preset = self._load(name, self._known[name])
+                if preset is not None:
+                    self._completed.append((callback, preset))
+            rescan = not self._wake.wait(self._rescan_interval)
+            self._wake.clear()
+
+    def _scan(self):
+        try:
+            file_names = os.listdir(self._folder)
+        except OSError as e:
+            self._warn("Cannot scan preset folder %s: %s", self._folder, e)
+            return
+        known = {}
+        for file_name in file_names:
+            if not file_name.endswith(PRESET_EXTENSION):
+                continue
+            name = file_name[:-len(PRESET_EXTENSION)]
+            try:
+                known[name] = os.stat(self._path(name)).st_mtime
+            except OSError:
+                continue
+        self._from_bank = set()
+        if self._scan_bank():
+            bank_mtime = self._bank_mtime
+            for name in self._bank.names():
+                if name not in known:
+                    known[name] = bank_mtime
+                    self._from_bank.add(name)
+        with self._lock:
+            for name in list(self._presets):
+                if name not in known:
+                    del self._presets[name]
+            self._known = known
+            stale = [name for name, mtime in known.items()
+                     if name not in self._presets or self._presets[name][0] != mtime]
+        # Reload changed files, load new ones while the cache has room
+        room = self._max_entries - len(self._presets)
+        for name in stale:
+            if name in self._presets or room > 0:
+                if name not in self._presets:
+                    room -= 1
+                self._load(name, known[name])
+
+    def _scan_bank(self):
+        # Reopens the bank when it was replaced, returns True if one is open
+        if self._bank_path is None:
+            return False
+        try:
+            mtime = os.stat(self._bank_path).st_mtime
+        except OSError:
+            mtime = None
+        if mtime != self._bank_mtime:
+            if self._bank is not None:
+                self._bank.close()
+                self._bank = None
+            self._bank_mtime = mtime
+            if mtime is not None:
+                try:
+                    self._bank = PresetBank(self._bank_path)
+                except (OSError, PresetBankError) as e:
+                    self._warn("Cannot open preset bank: %s", e)
+        return self._bank is not None
+
+    def _load(self, name, mtime):
+        try:
+            if name in self._from_bank:
+                preset = self._bank.get(name)
+            else:
+                with open(self._path(name), 'r') as f:
+                    preset = json.loads(f.read())
+        except Exception as e:
+            self._warn("Error reading preset file %s: %s", name, e)
+            return None
+        with self._lock:
+            self._insert(name, mtime, preset)
+        return preset
+
+    def _insert(self, name, mtime, preset):
+        self._presets[name] = (mtime, preset)
+        self._presets.move_to_end(name)
+        while len(self._presets) > self._max_entries:
+            self._presets.popitem(last=False)
+
+    def _warn(self, message, *args):
+        # Logged from poll(), Live's log is only written on the main thread
+        if self._log is not None:
+            self._completed.append((lambda _: self._log.warning(message, *args), None))
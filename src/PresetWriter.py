@@ -0,0 +1,90 @@
+import os
+import json
+import threading
+from collections import OrderedDict, deque
+
+
+class PresetWriter:
+    """
+    Writes preset files on a background thread.
+
+    Every file is written to a temporary file next to it and renamed over the
+    old one, so a crash never leaves a truncated preset. Saves of the same path
+    that are still waiting collapse into one write of the latest preset. When
+    a write finishes, callback(name, preset, mtime, error) runs on the main
+    thread from poll(), which the script calls once per tick; error is None on
+    success.
+    """
+
+    def __init__(self, log=None):
+        self._log = log
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()
+        self._completed = deque()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="FC200 preset writer")
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        """ Stops the thread after it wrote what is still pending """
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(2.0)
+            self._thread = None
+
+    def save(self, path, name, preset, callback=None):
+        """ Queues preset for writing to path, the preset must not be changed afterwards """
+        with self._lock:
+            collapsed = path in self._pending
+            self._pending[path] = (name, preset, callback)
+        if collapsed and self._log is not None:
+            self._log.debug("Collapsed pending save of preset %s", name)
+        self._wake.set()
+
+    def is_pending(self, path):
+        return path in self._pending
+
+    def poll(self):
+        """ Runs completed write callbacks, main thread only """
+        while self._completed:
+            callback, args = self._completed.popleft()
+            callback(*args)
+
+    def _run(self):
+        while True:
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        break
+                    path, (name, preset, callback) = self._pending.popitem(last=False)
+                mtime, error = self._write(path, preset)
+                if callback is not None:
+                    self._completed.append((callback, (name, preset, mtime, error)))
+            if self._stopped:
+                return
+            self._wake.wait()
+            self._wake.clear()
+
+    def _write(self, path, preset):
+        temp_path = path + ".tmp"
+        try:
+            data = json.dumps(preset, indent=2)
+            with open(temp_path, 'w') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+            return os.path.getmtime(path), None
+        except Exception as e:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return None, e
@@ -0,0 +1,77 @@
+class SceneIndex:
+    """
+    Cached view of the song's scenes and the selected scene's position.
+
+    The scene list and scene names are copied once and kept current by the
+    song's scenes listener and a name listener per scene, so navigation never
+    copies the scene list across the Live API. When the selection changes, its
+    new index is searched outwards from the previous one, which finds a move
+    to a neighbouring scene straight away. on_selected runs after the index is
+    updated.
+    """
+
+    def __init__(self, song, registry, on_selected=None, log=None):
+        self._song = song
+        self._registry = registry
+        self._on_selected = on_selected
+        self._log = log
+        self._scenes = ()
+        self._names = []
+        self.index = -1
+        registry.add(song, "scenes", self._on_scenes_changed, "scenes")
+        registry.add(song.view, "selected_scene", self._on_selected_scene_changed, "scenes")
+        self._rebuild()
+
+    def __len__(self):
+        return len(self._scenes)
+
+    def scene(self, index):
+        return self._scenes[index]
+
+    def name(self, index):
+        return self._names[index]
+
+    def selected_name(self):
+        return self._names[self.index] if self.index >= 0 else None
+
+    def neighbour(self, direction):
+        """ Index of the scene direction steps from the selected one, or None past either end """
+        index = self.index + direction
+        if self.index < 0 or not 0 <= index < len(self._scenes):
+            return None
+        return index
+
+    def disconnect(self):
+        self._registry.clear("scene names")
+        self._registry.clear("scenes")
+
+    def _rebuild(self):
+        self._registry.clear("scene names")
+        self._scenes = tuple(self._song.scenes)
+        self._names = [scene.name for scene in self._scenes]
+        for i, scene in enumerate(self._scenes):
+            self._registry.add(scene, "name", lambda i=i: self._on_name_changed(i), "scene names")
+        self.index = self._find(self._song.view.selected_scene)
+        if self._log is not None:
+            self._log.debug("Scene index rebuilt: %d scenes, selected %d", len(self._scenes), self.index)
+
+    def _find(self, scene):
+        scenes = self._scenes
+        count = len(scenes)
+        start = self.index if 0 <= self.index < count else 0
+        for distance in range(count):
+            for i in ((start + distance, start - distance) if distance else (start,)):
+                if 0 <= i < count and scenes[i] == scene:
+                    return i
+        return -1
+
+    def _on_scenes_changed(self):
+        self._rebuild()
+
+    def _on_selected_scene_changed(self):
+        self.index = self._find(self._song.view.selected_scene)
+        if self._on_selected is not None:
+            self._on_selected()
+
+    def _on_name_changed(self, index):
+        self._names[index] = self._scenes[index].name
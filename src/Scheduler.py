@@ -0,0 +1,51 @@
+import heapq
+from itertools import count
+
+
+class DeadlineScheduler:
+    """
+    One-shot callbacks due a number of ticks from now.
+
+    Callbacks sit in a heap ordered by their due tick, so a tick with nothing
+    due is one comparison and components with nothing armed cost nothing.
+    schedule(ticks, callback) runs callback on the first tick after ticks
+    ticks have passed, which matches the old countdowns that started at ticks
+    and acted when they reached zero. Cancelled callbacks are dropped lazily
+    when they come up.
+    """
+
+    def __init__(self):
+        self._now = 0
+        self._heap = []
+        self._active = {}
+        self._ids = count()
+
+    def schedule(self, ticks, callback):
+        """ Returns a handle for cancel() """
+        handle = next(self._ids)
+        self._active[handle] = callback
+        heapq.heappush(self._heap, (self._now + ticks, handle))
+        return handle
+
+    def cancel(self, handle):
+        """ Returns True if the callback was still waiting """
+        return self._active.pop(handle, None) is not None
+
+    def is_scheduled(self, handle):
+        return handle in self._active
+
+    def active_count(self):
+        return len(self._active)
+
+    def tick(self):
+        self._now += 1
+        heap = self._heap
+        while heap and heap[0][0] < self._now:
+            _, handle = heapq.heappop(heap)
+            callback = self._active.pop(handle, None)
+            if callback is not None:
+                callback()
+
+    def clear(self):
+        self._heap = []
+        self._active.clear()
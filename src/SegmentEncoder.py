@@ -8,8 +8,13 @@ class SegmentEncoder:
         'K': 110, 'L': 7,   'M': 107, 'N': 98,  'O': 99,
         'P': 94,  'Q': 124, 'R': 66,  'S': 109, 'T': 71,
         'U': 55,  'V': 35,  'W': 85,  'X': 118, 'Y': 117,
-        'Z': 91,  ' ': 0
+        'Z': 91,  ' ': 0,   '-': 64
     }
+    CACHE_SIZE = 256
+
+    # text -> segments of every character, and (text, digits) -> display frames
+    _encoded = {}
+    _frames = {}
 
     @classmethod
     def get_segments(cls, char):
@@ -25,3 +30,41 @@ class SegmentEncoder:
             char_key = " "
             
         return cls.MAP.get(char_key, 0)
+
+    @classmethod
+    def encode(cls, text):
+        """
+        Converts a whole string into a tuple with the bitmask of every
+        character, memoized per string.
+        """
+        segments = cls._encoded.get(text)
+        if segments is None:
+            if len(cls._encoded) >= cls.CACHE_SIZE:
+                cls._encoded.clear()
+            get = cls.MAP.get
+            segments = cls._encoded[text] = tuple(get(char, 0) for char in text.upper())
+        return segments
+
+    @classmethod
+    def frames(cls, text, digits):
+        """
+        The display frames showing text on a display of digits digits, a
+        frame holding the bitmask of every digit. Text that fits is one frame,
+        padded with blanks. Longer text is a marquee: text followed by a blank,
+        shifted one character per frame, the last frame leading back into the
+        first.
+        """
+        key = (text, digits)
+        frames = cls._frames.get(key)
+        if frames is None:
+            if len(cls._frames) >= cls.CACHE_SIZE:
+                cls._frames.clear()
+            segments = cls.encode(text)
+            if len(segments) <= digits:
+                frames = (segments + (0,) * (digits - len(segments)),)
+            else:
+                loop = segments + (0,)
+                wrapped = loop + loop[:digits - 1]
+                frames = tuple(wrapped[i:i + digits] for i in range(len(loop)))
+            cls._frames[key] = frames
+        return frames
@@ -9,30 +9,32 @@ class SpecialChannelStripComponent(ChannelStripComponent):
     """ Subclass of channel strip component using select button for (un)folding tracks """
     __module__ = __name__
 
-    def __init__(self):
+    def __init__(self, scheduler):
         ChannelStripComponent.__init__(self)
-        self._toggle_fold_ticks_delay = -1
-        self._register_timer_callback(self._on_timer)
+        self._scheduler = scheduler
+        self._toggle_fold_timer = None
 
     def disconnect(self):
-        self._unregister_timer_callback(self._on_timer)
+        self._cancel_toggle_fold()
         ChannelStripComponent.disconnect(self)
 
     def _select_value(self, value):
         ChannelStripComponent._select_value(self, value)
         if (self.is_enabled() and (self._track != None)):
+            self._cancel_toggle_fold()
             if (self._track.is_foldable and (self._select_button.is_momentary() and (value != 0))):
-                self._toggle_fold_ticks_delay = TRACK_FOLD_DELAY
-            else:
-                self._toggle_fold_ticks_delay = -1
+                self._toggle_fold_timer = self._scheduler.schedule(TRACK_FOLD_DELAY, self._toggle_fold)
 
-    def _on_timer(self):
+    def _cancel_toggle_fold(self):
+        if (self._toggle_fold_timer != None):
+            self._scheduler.cancel(self._toggle_fold_timer)
+            self._toggle_fold_timer = None
+
+    def _toggle_fold(self):
+        self._toggle_fold_timer = None
         if (self.is_enabled() and (self._track != None)):
-            if (self._toggle_fold_ticks_delay > -1):
-                assert self._track.is_foldable
-                if (self._toggle_fold_ticks_delay == 0):
-                    self._track.fold_state = (not self._track.fold_state)
-                self._toggle_fold_ticks_delay -= 1
+            assert self._track.is_foldable
+            self._track.fold_state = (not self._track.fold_state)
 
 
 # local variables:
@@ -6,12 +6,14 @@ class SpecialMixerComponent(MixerComponent):
     """ Special mixer class that uses return tracks alongside midi and audio tracks """
     __module__ = __name__
 
-    def __init__(self, num_tracks):
+    def __init__(self, num_tracks, scheduler):
+        # Set before the base class creates the strips
+        self._scheduler = scheduler
         MixerComponent.__init__(self, num_tracks)
 
     def tracks_to_use(self):
         return tuple(self.song().visible_tracks) + tuple(self.song().return_tracks)
 
     def _create_strip(self):
-        return SpecialChannelStripComponent()
+        return SpecialChannelStripComponent(self._scheduler)
 
@@ -11,21 +11,21 @@ class DetailViewControllerComponent(ControlSurfaceComponent):
     __module__ = __name__
     __doc__ = ' Component that can toggle the device chain- and clip view of the selected track '
 
-    def __init__(self):
+    def __init__(self, scheduler):
         ControlSurfaceComponent.__init__(self)
+        self._scheduler = scheduler
         self._device_clip_toggle_button = None
         self._detail_toggle_button = None
         self._left_button = None
         self._right_button = None
         #self._shift_button = None
         #self._shift_pressed = False
-        self._show_playing_clip_ticks_delay = -1
+        self._show_playing_clip_timer = None
         self.application().view.add_is_view_visible_listener('Detail', self._detail_view_visibility_changed)
-        self._register_timer_callback(self._on_timer)
         return None
 
     def disconnect(self):
-        self._unregister_timer_callback(self._on_timer)
+        self._cancel_show_playing_clip()
         self.application().view.remove_is_view_visible_listener('Detail', self._detail_view_visibility_changed)
         if self._device_clip_toggle_button != None:
             self._device_clip_toggle_button.remove_value_listener(self._device_clip_toggle_value)
@@ -162,11 +162,9 @@ class DetailViewControllerComponent(ControlSurfaceComponent):
                 else:
                     self.application().view.is_view_visible('Detail/DeviceChain')
                     self.application().view.show_view('Detail/Clip')
+            self._cancel_show_playing_clip()
             if button_is_momentary and value != 0:
-                self._show_playing_clip_ticks_delay = SHOW_PLAYING_CLIP_DELAY
-            else:
-                button_is_momentary
-                self._show_playing_clip_ticks_delay = -1
+                self._show_playing_clip_timer = self._scheduler.schedule(SHOW_PLAYING_CLIP_DELAY, self._show_playing_clip)
         else:
             self.is_enabled()
         return None
@@ -207,14 +205,17 @@ class DetailViewControllerComponent(ControlSurfaceComponent):
                         direction = Live.Application.Application.View.NavDirection.right
                     self.application().view.scroll_view(direction, 'Detail/DeviceChain', (not modifier_pressed))
 
-    def _on_timer(self):
+    def _cancel_show_playing_clip(self):
+        if (self._show_playing_clip_timer != None):
+            self._scheduler.cancel(self._show_playing_clip_timer)
+            self._show_playing_clip_timer = None
+
+    def _show_playing_clip(self):
+        self._show_playing_clip_timer = None
         if self.is_enabled(): # and (not self._shift_pressed):
-            if (self._show_playing_clip_ticks_delay > -1):
-                if (self._show_playing_clip_ticks_delay == 0):
-                    song = self.song()
-                    playing_slot_index = song.view.selected_track.playing_slot_index
-                    if (playing_slot_index > -1):
-                        song.view.selected_scene = song.scenes[playing_slot_index]
-                        if song.view.highlighted_clip_slot.has_clip:
-                            self.application().view.show_view('Detail/Clip')
-                self._show_playing_clip_ticks_delay -= 1
+            song = self.song()
+            playing_slot_index = song.view.selected_track.playing_slot_index
+            if (playing_slot_index > -1):
+                song.view.selected_scene = song.scenes[playing_slot_index]
+                if song.view.highlighted_clip_slot.has_clip:
+                    self.application().view.show_view('Detail/Clip')
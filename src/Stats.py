@@ -0,0 +1,100 @@
+import time
+from bisect import bisect_left
+
+# Upper bounds of the latency buckets in seconds, from 10 us to 1 s
+BUCKETS = tuple(scale * decade for decade in (1e-5, 1e-4, 1e-3, 1e-2, 1e-1) for scale in (1, 2, 5)) + (1.0,)
+
+
+class Histogram:
+    """
+    Latencies counted in fixed buckets, so recording one is a bisect and an
+    increment however many are recorded. Percentiles are reported as the
+    upper bound of the bucket they fall in.
+    """
+
+    __slots__ = ("counts", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.total += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        """ Upper bound of the bucket holding the given fraction, at most the max """
+        if not self.total:
+            return 0.0
+        rank = max(1, int(round(fraction * self.total)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(BUCKETS[index], self.max) if index < len(BUCKETS) else self.max
+        return self.max
+
+
+class LatencyStats:
+    """ A histogram per action, e.g. per pedal handler """
+
+    def __init__(self):
+        self._histograms = {}
+
+    def record(self, action, seconds):
+        histogram = self._histograms.get(action)
+        if histogram is None:
+            histogram = self._histograms[action] = Histogram()
+        histogram.record(seconds)
+
+    def histogram(self, action):
+        return self._histograms.get(action)
+
+    def summary(self):
+        """ One line per action, busiest first """
+        lines = []
+        for action, h in sorted(self._histograms.items(), key=lambda item: -item[1].total):
+            lines.append("%s: %d, p50 %s, p95 %s, p99 %s, max %s" % (
+                action, h.total, format_seconds(h.percentile(0.5)), format_seconds(h.percentile(0.95)),
+                format_seconds(h.percentile(0.99)), format_seconds(h.max)))
+        return lines
+
+    def clear(self):
+        self._histograms.clear()
+
+
+class RateCounter:
+    """
+    Counts events into one second windows. count is incremented directly by
+    the caller, roll() is called once per tick and closes the window once a
+    second has passed.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._window_start = clock()
+        self.count = 0
+        self.rate = 0.0
+        self.peak = 0.0
+        self.total = 0
+
+    def roll(self):
+        now = self._clock()
+        elapsed = now - self._window_start
+        if elapsed < 1.0:
+            return
+        self.rate = self.count / elapsed
+        if self.rate > self.peak:
+            self.peak = self.rate
+        self.total += self.count
+        self.count = 0
+        self._window_start = now
+
+
+def format_seconds(seconds):
+    if seconds < 1e-3:
+        return "%.0f us" % (seconds * 1e6)
+    return "%.1f ms" % (seconds * 1e3)
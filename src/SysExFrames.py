@@ -0,0 +1,48 @@
+# Roland DT1 (data set) header as sent to the FC-200
+HEADER = (240, 65, 0, 114, 18)
+END = 247
+
+LED_BANK = 1
+DISPLAY_BANK = 2
+LED_PEDALS = 13     # pedals 0-9, bank up/down and CTL
+DISPLAY_DIGITS = 2
+
+
+def checksum(bank, pedal, value):
+    return (128 - ((bank + pedal + value) % 128)) % 128
+
+
+def frame_key(bank, pedal, value):
+    """ Packs an address and value into a single int, the key of frames and dispatch rows """
+    return (bank << 16) | (pedal << 8) | value
+
+
+def build_frame(bank, pedal, value):
+    return HEADER + (bank, pedal, value, checksum(bank, pedal, value), END)
+
+
+class SysExFrames:
+    # Every LED and display frame is built once at import time, anything
+    # else is built on first use and memoized.
+    TABLE = {}
+
+    @classmethod
+    def frame(cls, bank, pedal, value):
+        """
+        Returns the complete DT1 frame for (bank, pedal, value).
+        """
+        key = frame_key(bank, pedal, value)
+        frame = cls.TABLE.get(key)
+        if frame is None:
+            frame = cls.TABLE[key] = build_frame(bank, pedal, value)
+        return frame
+
+    @classmethod
+    def prebuild(cls, bank, pedals):
+        for pedal in range(pedals):
+            for value in range(128):
+                cls.TABLE[frame_key(bank, pedal, value)] = build_frame(bank, pedal, value)
+
+
+SysExFrames.prebuild(LED_BANK, LED_PEDALS)
+SysExFrames.prebuild(DISPLAY_BANK, DISPLAY_DIGITS)
@@ -0,0 +1,63 @@
+from .SysExFrames import HEADER, END
+
+FRAME_LENGTH = 10
+INVALID = -1
+
+# Expected checksum for every bank + pedal + value sum of 7 bit data bytes
+CHECKSUMS = tuple((128 - (total % 128)) % 128 for total in range(3 * 128))
+
+# The header bytes are compared one by one, so lists, tuples and bytes all parse
+H0, H1, H2, H3, H4 = HEADER
+
+
+def parse(midi_bytes):
+    """
+    Validates a single DT1 frame and returns its packed event key
+    (bank << 16 | pedal << 8 | value), or INVALID.
+    """
+    if (len(midi_bytes) != FRAME_LENGTH or midi_bytes[9] != END or midi_bytes[0] != H0 or midi_bytes[1] != H1
+            or midi_bytes[2] != H2 or midi_bytes[3] != H3 or midi_bytes[4] != H4):
+        return INVALID
+    bank = midi_bytes[5]
+    pedal = midi_bytes[6]
+    value = midi_bytes[7]
+    if (bank | pedal | value) & ~0x7F or midi_bytes[8] != CHECKSUMS[bank + pedal + value]:
+        return INVALID
+    return (bank << 16) | (pedal << 8) | value
+
+
+def parse_at(buffer, offset):
+    """ Same as parse() for a frame starting at offset inside a larger buffer """
+    if (buffer[offset + 9] != END or buffer[offset] != H0 or buffer[offset + 1] != H1
+            or buffer[offset + 2] != H2 or buffer[offset + 3] != H3 or buffer[offset + 4] != H4):
+        return INVALID
+    bank = buffer[offset + 5]
+    pedal = buffer[offset + 6]
+    value = buffer[offset + 7]
+    if (bank | pedal | value) & ~0x7F or buffer[offset + 8] != CHECKSUMS[bank + pedal + value]:
+        return INVALID
+    return (bank << 16) | (pedal << 8) | value
+
+
+def parse_batch(buffer):
+    """
+    Splits a buffer of concatenated F0 ... F7 messages and returns the event
+    keys of the valid DT1 frames in order. Other messages are skipped.
+    """
+    events = []
+    length = len(buffer)
+    start = 0
+    while start < length:
+        if buffer[start] != 240:
+            start += 1
+            continue
+        try:
+            end = buffer.index(END, start)
+        except ValueError:
+            break
+        if end - start + 1 == FRAME_LENGTH:
+            event = parse_at(buffer, start)
+            if event != INVALID:
+                events.append(event)
+        start = end + 1
+    return events
@@ -0,0 +1,68 @@
+from .SegmentEncoder import SegmentEncoder
+from .SysExFrames import DISPLAY_DIGITS
+from .MidiOutQueue import PRIORITY_NORMAL
+
+
+class TextRenderer:
+    """
+    Shows text on the two-digit display.
+
+    Text is turned into display frames once by SegmentEncoder.frames(), so
+    showing a string that was shown before costs a dict lookup. Text longer
+    than the display scrolls as a marquee, stepped by the script's scheduler
+    until other text is shown. Every digit goes to write(digit, segments,
+    priority), which is expected to drop digits the display already shows,
+    as MidiOutQueue does, so a frame only sends the digits that changed.
+    """
+
+    def __init__(self, write, scheduler, digits=DISPLAY_DIGITS, step_ticks=3):
+        self._write = write
+        self._scheduler = scheduler
+        self._digits = digits
+        self._step_ticks = step_ticks
+        self._text = None
+        self._frames = ()
+        self._frame = 0
+        self._priority = PRIORITY_NORMAL
+        self._timer = None
+
+    @property
+    def text(self):
+        return self._text
+
+    def show(self, text, priority=PRIORITY_NORMAL):
+        text = str(text)
+        if text == self._text and self._timer is not None:
+            # Keep scrolling instead of starting the marquee over
+            return
+        self.stop()
+        self._text = text
+        self._frames = SegmentEncoder.frames(text, self._digits)
+        self._frame = 0
+        self._priority = priority
+        self._show_frame()
+        if len(self._frames) > 1:
+            self._timer = self._scheduler.schedule(self._step_ticks, self._step)
+
+    def redraw(self):
+        """ Writes the frame shown again, for a display that lost its state """
+        if self._text is not None:
+            self._show_frame()
+
+    def is_scrolling(self):
+        return self._timer is not None
+
+    def stop(self):
+        """ Stops the marquee on the frame it shows """
+        if self._timer is not None:
+            self._scheduler.cancel(self._timer)
+            self._timer = None
+
+    def _step(self):
+        self._frame = (self._frame + 1) % len(self._frames)
+        self._show_frame()
+        self._timer = self._scheduler.schedule(self._step_ticks, self._step)
+
+    def _show_frame(self):
+        for digit, segments in enumerate(self._frames[self._frame]):
+            self._write(digit, segments, self._priority)
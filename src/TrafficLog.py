@@ -0,0 +1,129 @@
+import struct
+import time
+
+# A traffic log is a series of sessions, one per time the script was loaded:
+#   session header: magic, version, wall clock start (unix seconds)
+#   record:         direction, microseconds since the previous record, length, bytes
+MAGIC = b"FC2T"
+VERSION = 1
+SESSION = struct.Struct("<4sBd")
+RECORD = struct.Struct("<BIH")
+MAX_DELTA = 0xFFFFFFFF      # gaps of more than ~71 minutes are recorded as this
+
+IN = 0      # received in handle_sysex
+OUT = 1     # sent with _send_midi
+
+
+class TrafficLogError(Exception):
+    pass
+
+
+class TrafficRecorder:
+    """
+    Appends every MIDI message in and out of the script to a traffic log,
+    timestamped with a monotonic clock. A record costs 7 bytes plus the
+    message. Records go through the file's buffer; flush() is called once per
+    tick so a recording never lags more than a tick behind.
+    """
+
+    def __init__(self, path, clock=time.monotonic, log=None):
+        self._clock = clock
+        self._log = log
+        self._file = open(path, "ab")
+        self._drop_cut_off_record(path)
+        self._file.write(SESSION.pack(MAGIC, VERSION, time.time()))
+        self._last = clock()
+        self._dirty = True
+        self.records = 0
+
+    def record(self, direction, midi_bytes):
+        now = self._clock()
+        delta = min(MAX_DELTA, max(0, int(round((now - self._last) * 1e6))))
+        self._last = now
+        self._file.write(RECORD.pack(direction, delta, len(midi_bytes)) + bytes(midi_bytes))
+        self._dirty = True
+        self.records += 1
+
+    def flush(self):
+        if self._dirty:
+            self._file.flush()
+            self._dirty = False
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            if self._log is not None:
+                self._log.info("Recorded %d MIDI messages", self.records)
+
+    def _drop_cut_off_record(self, path):
+        """
+        Truncates a log left with half a record by a crash back to its last
+        complete one, so the session about to start does not end up inside it
+        """
+        size = self._file.tell()
+        if not size:
+            return
+        with open(path, "rb") as f:
+            data = f.read()
+        try:
+            end = 0
+            for end, _ in _entries(data, path):
+                pass
+        except TrafficLogError:
+            self._file.close()
+            raise
+        if end < size:
+            self._file.truncate(end)
+            self._file.seek(end)
+            if self._log is not None:
+                self._log.warning("Dropped %d bytes cut off at the end of %s", size - end, path)
+
+
+def read_sessions(path):
+    """
+    Reads a traffic log into [(started, [(seconds, direction, midi_bytes)])],
+    seconds counted from the start of the session.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    sessions = []
+    for _, entry in _entries(data, path):
+        if len(entry) == 1:
+            records = []
+            sessions.append((entry[0], records))
+            seconds = 0.0
+        else:
+            delta, direction, midi_bytes = entry
+            seconds += delta / 1e6
+            records.append((seconds, direction, midi_bytes))
+    return sessions
+
+
+def _entries(data, path=""):
+    """
+    Yields (end offset, entry) for each complete entry in data: (started,)
+    for a session header, (delta, direction, midi_bytes) for a record. Stops
+    at an entry cut off while the script was writing it.
+    """
+    offset = 0
+    while offset < len(data):
+        if data[offset:offset + len(MAGIC)] == MAGIC:
+            if offset + SESSION.size > len(data):
+                return
+            magic, version, started = SESSION.unpack_from(data, offset)
+            if version != VERSION:
+                raise TrafficLogError("Unsupported traffic log version %d" % version)
+            offset += SESSION.size
+            yield offset, (started,)
+            continue
+        if offset == 0:
+            raise TrafficLogError("Not a traffic log: %s" % path)
+        if offset + RECORD.size > len(data):
+            return
+        direction, delta, length = RECORD.unpack_from(data, offset)
+        if offset + RECORD.size + length > len(data):
+            return
+        midi_bytes = tuple(data[offset + RECORD.size:offset + RECORD.size + length])
+        offset += RECORD.size + length
+        yield offset, (delta, direction, midi_bytes)